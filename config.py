@@ -1,150 +1,488 @@
+import dataclasses
+import enum
+import itertools
 import os
-from dotenv import load_dotenv
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Mapping
 
-# Load environment variables
-load_dotenv()
 
-# Bot configuration
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-DISCORD_BOT_TOKEN = os.getenv("DISCORD_BOT_TOKEN")
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+class CEFR(enum.IntEnum):
+    """CEFR language levels, ordered so level checks are integer compares"""
+    A1 = 1
+    A2 = 2
+    B1 = 3
+    B2 = 4
+    C1 = 5
+    C2 = 6
 
-# Memory settings
-SHORT_MEMORY_SIZE = int(os.getenv("SHORT_MEMORY_SIZE", "25"))
-LONG_MEMORY_SIZE = int(os.getenv("LONG_MEMORY_SIZE", "100"))
-MEMORY_DIR = os.getenv("MEMORY_DIR", "user_memories")
 
-# Web search settings
-MAX_SEARCH_RESULTS = int(os.getenv("MAX_SEARCH_RESULTS", "100"))
-# Web search decision model - determines whether to perform web search based on query
-WEB_SEARCH_DECISION_MODEL_ENABLED = True  # Always enabled to use Gemini for web search decisions
+class ResponseLength(enum.IntEnum):
+    """Response length buckets, aligned with RESPONSE_LENGTH_CUM_WEIGHTS"""
+    EXTREMELY_SHORT = 0
+    SLIGHTLY_SHORT = 1
+    MEDIUM = 2
+    SLIGHTLY_LONG = 3
+    LONG = 4
 
-# Proxy settings - DISABLED
-# Proxy system has been removed due to connection issues with DuckDuckGo
-PROXY_ENABLED = False
+
+# Enum members in distribution order, for indexing selection results
+LANGUAGE_LEVEL_CHOICES = tuple(CEFR)
+RESPONSE_LENGTH_CHOICES = tuple(ResponseLength)
+
+
+def _int(env: Mapping[str, str], key: str, default: int) -> int:
+    """Parse an integer setting from the environment"""
+    value = env.get(key)
+    return default if value is None else int(value)
+
+
+# Accepted truthy spellings for boolean settings
+_TRUTHY = frozenset({"1", "true", "yes", "on", "y", "t"})
+
+
+def _bool(env: Mapping[str, str], key: str, default: bool) -> bool:
+    """Parse a boolean setting from the environment"""
+    value = env.get(key)
+    return default if value is None else value.strip().lower() in _TRUTHY
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """
+    Immutable snapshot of all bot settings, built once at import time.
+
+    Downstream modules can read these as cheap attribute lookups on a slotted
+    object instead of going through module-level globals on every request.
+    """
+    # Bot configuration
+    TELEGRAM_BOT_TOKEN: str
+    DISCORD_BOT_TOKEN: str
+    GEMINI_API_KEY: str
+    LOG_LEVEL: str
+
+    # Memory settings
+    SHORT_MEMORY_SIZE: int
+    LONG_MEMORY_SIZE: int
+    MEMORY_DIR: str
+    LANGUAGE_CACHE_SIZE: int
+
+    # Web search settings
+    MAX_SEARCH_RESULTS: int
+    WEB_SEARCH_DECISION_MODEL_ENABLED: bool
+    MAX_SEARCH_RETRIES: int
+    MAX_PARALLEL_SEARCHES: int
+
+    # Prompt budget settings (characters)
+    PROMPT_HISTORY_CHAR_BUDGET: int
+    SEARCH_CONTEXT_CHAR_BUDGET: int
+
+    # Proxy settings - DISABLED
+    PROXY_ENABLED: bool
+    PROXY_FILE: str
+
+    # Time awareness settings
+    DEFAULT_TIMEZONE: str
+    TIME_AWARENESS_ENABLED: bool
+    SHOW_TIME_ONLY_WHEN_RELEVANT: bool
+
+    # Website link settings
+    SHOW_LINKS_ONLY_WHEN_RELEVANT: bool
+
+    # Self-awareness and environmental awareness settings
+    SELF_AWARENESS_ENABLED: bool
+    ENVIRONMENT_AWARENESS_ENABLED: bool
+    SELF_AWARENESS_SEARCH_ENABLED: bool
+    ENVIRONMENT_AWARENESS_LEVEL: int
+
+    # Word translation settings - DISABLED as requested
+    WORD_TRANSLATION_ENABLED: bool
+    DEFAULT_TRANSLATION_LANGUAGE: str
+    MIN_CEFR_LEVEL_FOR_TRANSLATION: "CEFR"
+    MIN_WORD_LENGTH_FOR_TRANSLATION: int
+    MAX_WORDS_TO_TRANSLATE: int
+
+    # Dynamic message length settings
+    DYNAMIC_MESSAGE_LENGTH_ENABLED: bool
+    EXTREMELY_SHORT_RESPONSE_PROBABILITY: float
+    SLIGHTLY_SHORT_RESPONSE_PROBABILITY: float
+    MEDIUM_RESPONSE_PROBABILITY: float
+    SLIGHTLY_LONG_RESPONSE_PROBABILITY: float
+    LONG_RESPONSE_PROBABILITY: float
+    RESPONSE_LENGTH_RANDOMNESS: float
+
+    # Slang and casual language settings
+    SLANG_ENABLED: bool
+    SLANG_PROBABILITY: float
+    SLANG_LEVEL: int
+
+    # Dynamic language level settings
+    DYNAMIC_LANGUAGE_LEVEL_ENABLED: bool
+    A1_LANGUAGE_PROBABILITY: float
+    A2_LANGUAGE_PROBABILITY: float
+    B1_LANGUAGE_PROBABILITY: float
+    B2_LANGUAGE_PROBABILITY: float
+    C1_LANGUAGE_PROBABILITY: float
+    C2_LANGUAGE_PROBABILITY: float
+    LANGUAGE_LEVEL_RANDOMNESS: float
+
+    # Self-reflection settings - DISABLED
+    SELF_REFLECTION_ENABLED: bool
+    SELF_REFLECTION_PROBABILITY: float
+
+    # Gemini model settings
+    GEMINI_MODEL: str
+    GEMINI_TEMPERATURE: float
+    GEMINI_TOP_P: float
+    GEMINI_TOP_K: int
+    GEMINI_MAX_OUTPUT_TOKENS: int
+
+    # Model for web search decision
+    GEMINI_WEB_SEARCH_DECISION_MODEL: str
+    GEMINI_WEB_SEARCH_DECISION_TEMPERATURE: float
+    GEMINI_WEB_SEARCH_DECISION_TOP_P: float
+    GEMINI_WEB_SEARCH_DECISION_TOP_K: int
+    GEMINI_WEB_SEARCH_DECISION_MAX_OUTPUT_TOKENS: int
+
+    # Model for web search and language detection
+    GEMINI_FLASH_LITE_MODEL: str
+    GEMINI_FLASH_LITE_TEMPERATURE: float
+    GEMINI_FLASH_LITE_TOP_P: float
+    GEMINI_FLASH_LITE_TOP_K: int
+    GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS: int
+
+    # Model for image analysis
+    GEMINI_IMAGE_MODEL: str
+    GEMINI_IMAGE_TEMPERATURE: float
+    GEMINI_IMAGE_TOP_P: float
+    GEMINI_IMAGE_TOP_K: int
+    GEMINI_IMAGE_MAX_OUTPUT_TOKENS: int
+
+    # Model for word translation
+    GEMINI_TRANSLATION_MODEL: str
+    GEMINI_TRANSLATION_TEMPERATURE: float
+    GEMINI_TRANSLATION_TOP_P: float
+    GEMINI_TRANSLATION_TOP_K: int
+    GEMINI_TRANSLATION_MAX_OUTPUT_TOKENS: int
+
+
+def _build_config() -> Config:
+    """
+    Build the config singleton from the environment.
+
+    All environment lookups happen here, exactly once.
+    """
+    # One-shot snapshot: .env entries first, shell-exported variables win.
+    # A plain dict gives C-level get() instead of going through the
+    # os._Environ proxy (which encodes/decodes on every lookup), and the
+    # snapshot is discarded as soon as the dataclass is built.
+    env = dict(os.environ)
+    if not env.get("DISCORD_BOT_TOKEN") and not env.get("TELEGRAM_BOT_TOKEN"):
+        # Only parse .env when the tokens weren't injected by the shell or
+        # orchestrator; in that case dotenv is never even imported.
+        from dotenv import dotenv_values
+        env = {**dotenv_values(".env"), **env}
+
+    return Config(
+        # Bot configuration
+        TELEGRAM_BOT_TOKEN=env.get("TELEGRAM_BOT_TOKEN"),
+        DISCORD_BOT_TOKEN=env.get("DISCORD_BOT_TOKEN"),
+        GEMINI_API_KEY=env.get("GEMINI_API_KEY"),
+        # Root logging level; DEBUG additionally enables the console mirrors
+        LOG_LEVEL=env.get("LOG_LEVEL", "INFO").upper(),
+
+        # Memory settings
+        SHORT_MEMORY_SIZE=_int(env, "SHORT_MEMORY_SIZE", 25),
+        LONG_MEMORY_SIZE=_int(env, "LONG_MEMORY_SIZE", 100),
+        MEMORY_DIR=env.get("MEMORY_DIR", "user_memories"),
+        # Maximum number of per-chat detected languages to keep cached
+        LANGUAGE_CACHE_SIZE=_int(env, "LANGUAGE_CACHE_SIZE", 10000),
+
+        # Web search settings
+        MAX_SEARCH_RESULTS=_int(env, "MAX_SEARCH_RESULTS", 100),
+        # Web search decision model - always enabled to use Gemini for web search decisions
+        WEB_SEARCH_DECISION_MODEL_ENABLED=True,
+        # Maximum number of retries for DuckDuckGo searches
+        MAX_SEARCH_RETRIES=_int(env, "MAX_SEARCH_RETRIES", 10),
+        # Maximum number of DuckDuckGo searches to run concurrently
+        MAX_PARALLEL_SEARCHES=_int(env, "MAX_PARALLEL_SEARCHES", 8),
+
+        # Character caps applied before prompt assembly so long threads and
+        # large search dumps can't balloon prompt size, cost and latency
+        PROMPT_HISTORY_CHAR_BUDGET=_int(env, "PROMPT_HISTORY_CHAR_BUDGET", 24000),
+        SEARCH_CONTEXT_CHAR_BUDGET=_int(env, "SEARCH_CONTEXT_CHAR_BUDGET", 12000),
+
+        # Proxy settings - DISABLED
+        # Proxy system has been removed due to connection issues with DuckDuckGo
+        PROXY_ENABLED=False,
+        PROXY_FILE="",
+
+        # Time awareness settings
+        DEFAULT_TIMEZONE=env.get("DEFAULT_TIMEZONE", "Europe/Istanbul"),
+        TIME_AWARENESS_ENABLED=_bool(env, "TIME_AWARENESS_ENABLED", True),
+        # Only show time information when relevant to the conversation
+        SHOW_TIME_ONLY_WHEN_RELEVANT=_bool(env, "SHOW_TIME_ONLY_WHEN_RELEVANT", True),
+
+        # Website link settings
+        # Only show website links when explicitly requested or relevant
+        SHOW_LINKS_ONLY_WHEN_RELEVANT=_bool(env, "SHOW_LINKS_ONLY_WHEN_RELEVANT", True),
+
+        # Self-awareness and environmental awareness settings
+        SELF_AWARENESS_ENABLED=_bool(env, "SELF_AWARENESS_ENABLED", True),
+        ENVIRONMENT_AWARENESS_ENABLED=_bool(env, "ENVIRONMENT_AWARENESS_ENABLED", True),
+        SELF_AWARENESS_SEARCH_ENABLED=_bool(env, "SELF_AWARENESS_SEARCH_ENABLED", True),
+        # Level of detail for environmental awareness (1-5)
+        ENVIRONMENT_AWARENESS_LEVEL=_int(env, "ENVIRONMENT_AWARENESS_LEVEL", 3),
+
+        # Word translation settings - DISABLED as requested
+        WORD_TRANSLATION_ENABLED=False,
+        # Default language for translation is German (kept for backward compatibility)
+        DEFAULT_TRANSLATION_LANGUAGE="German",
+        # Translate words with A2 level and above (kept for backward compatibility)
+        MIN_CEFR_LEVEL_FOR_TRANSLATION=CEFR.A2,
+        # These settings are kept for backward compatibility but are not used
+        MIN_WORD_LENGTH_FOR_TRANSLATION=_int(env, "MIN_WORD_LENGTH_FOR_TRANSLATION", 4),
+        MAX_WORDS_TO_TRANSLATE=_int(env, "MAX_WORDS_TO_TRANSLATE", 5),
+
+        # Dynamic message length settings - Her zaman etkin
+        DYNAMIC_MESSAGE_LENGTH_ENABLED=True,
+        # Probability distribution for different response lengths
+        # Daha uzun ve insan gibi yanıt dağılımı - uzun yanıtlar için daha yüksek olasılık
+        EXTREMELY_SHORT_RESPONSE_PROBABILITY=0.05,  # Çok kısa yanıtlar için düşük olasılık
+        SLIGHTLY_SHORT_RESPONSE_PROBABILITY=0.10,  # Kısa yanıtlar için düşük olasılık
+        MEDIUM_RESPONSE_PROBABILITY=0.25,  # Orta uzunlukta yanıtlar için orta olasılık
+        SLIGHTLY_LONG_RESPONSE_PROBABILITY=0.35,  # Biraz uzun yanıtlar için yüksek olasılık
+        LONG_RESPONSE_PROBABILITY=0.25,  # Uzun yanıtlar için yüksek olasılık
+        # Randomness factor for response length (0.0-1.0, higher = more random)
+        RESPONSE_LENGTH_RANDOMNESS=0.7,  # Doğal insan yanıtları için orta seviye rastgelelik
+
+        # Slang and casual language settings
+        SLANG_ENABLED=True,  # Always enable slang and casual language
+        # Probability of using slang in a response (0.0-1.0)
+        SLANG_PROBABILITY=1.0,  # Maximum probability for natural slang usage
+        # Maximum level of slang/swearing (1-5, where 5 is most casual/explicit)
+        SLANG_LEVEL=5,  # Maximum level for natural casual/explicit language
+
+        # Dynamic language level settings - Enabled with completely natural human-like distribution
+        DYNAMIC_LANGUAGE_LEVEL_ENABLED=True,
+        # Probability distribution for different language levels (A1-C2)
+        # Natural distribution like a real human - varies based on context and content
+        A1_LANGUAGE_PROBABILITY=0.15,  # Simple language
+        A2_LANGUAGE_PROBABILITY=0.15,  # Elementary language
+        B1_LANGUAGE_PROBABILITY=0.20,  # Intermediate language
+        B2_LANGUAGE_PROBABILITY=0.20,  # Upper-intermediate language
+        C1_LANGUAGE_PROBABILITY=0.15,  # Advanced language
+        C2_LANGUAGE_PROBABILITY=0.15,  # Proficient language
+        # Randomness factor for language level (maximum for unpredictable human-like variation)
+        LANGUAGE_LEVEL_RANDOMNESS=1.0,  # Maximum randomness for natural human-like unpredictability
+
+        # Self-reflection settings - DISABLED
+        SELF_REFLECTION_ENABLED=False,
+        SELF_REFLECTION_PROBABILITY=0.0,
+
+        # Gemini model settings
+        GEMINI_MODEL="gemini-2.0-flash-lite",
+        GEMINI_TEMPERATURE=1.0,  # Maximum temperature for ultra-creative, unpredictable, and human-like responses
+        GEMINI_TOP_P=0.99,
+        GEMINI_TOP_K=80,
+        GEMINI_MAX_OUTPUT_TOKENS=4096,  # Increased max tokens to allow longer responses
+
+        # Model for web search decision
+        GEMINI_WEB_SEARCH_DECISION_MODEL="gemini-2.5-flash-preview-04-17",  # Using the latest Gemini model for better decision making
+        GEMINI_WEB_SEARCH_DECISION_TEMPERATURE=0.0,  # Deterministic decisions, also cache-friendly
+        GEMINI_WEB_SEARCH_DECISION_TOP_P=1.0,
+        GEMINI_WEB_SEARCH_DECISION_TOP_K=1,
+        # The decision is a single YES/NO line; no need to budget for more
+        GEMINI_WEB_SEARCH_DECISION_MAX_OUTPUT_TOKENS=64,
+
+        # Model for web search and language detection
+        GEMINI_FLASH_LITE_MODEL="gemini-2.0-flash-lite",
+        GEMINI_FLASH_LITE_TEMPERATURE=0.4,
+        GEMINI_FLASH_LITE_TOP_P=0.95,
+        GEMINI_FLASH_LITE_TOP_K=32,
+        GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS=8192,
+
+        # Model for image analysis
+        GEMINI_IMAGE_MODEL="gemini-2.5-pro-exp-03-25",
+        GEMINI_IMAGE_TEMPERATURE=0.7,
+        GEMINI_IMAGE_TOP_P=0.95,
+        GEMINI_IMAGE_TOP_K=40,
+        GEMINI_IMAGE_MAX_OUTPUT_TOKENS=4096,
+
+        # Model for word translation
+        GEMINI_TRANSLATION_MODEL="gemini-2.0-flash-lite",
+        GEMINI_TRANSLATION_TEMPERATURE=0.1,
+        GEMINI_TRANSLATION_TOP_P=0.95,
+        GEMINI_TRANSLATION_TOP_K=40,
+        GEMINI_TRANSLATION_MAX_OUTPUT_TOKENS=1024,
+    )
+
+
+# Singleton config instance
+CFG = _build_config()
+
+# Read-only mapping over the full config surface. Downstream caches can key
+# on id(CONFIG_VIEW) (stable for the process lifetime) instead of hashing
+# individual values, and any attempted write raises TypeError.
+CONFIG_VIEW: Mapping[str, object] = MappingProxyType(dataclasses.asdict(CFG))
+
+# Module-level names kept for backward compatibility with existing imports
+TELEGRAM_BOT_TOKEN = CFG.TELEGRAM_BOT_TOKEN
+DISCORD_BOT_TOKEN = CFG.DISCORD_BOT_TOKEN
+GEMINI_API_KEY = CFG.GEMINI_API_KEY
+LOG_LEVEL = CFG.LOG_LEVEL
+
+SHORT_MEMORY_SIZE = CFG.SHORT_MEMORY_SIZE
+LONG_MEMORY_SIZE = CFG.LONG_MEMORY_SIZE
+MEMORY_DIR = CFG.MEMORY_DIR
+LANGUAGE_CACHE_SIZE = CFG.LANGUAGE_CACHE_SIZE
+
+MAX_SEARCH_RESULTS = CFG.MAX_SEARCH_RESULTS
+WEB_SEARCH_DECISION_MODEL_ENABLED = CFG.WEB_SEARCH_DECISION_MODEL_ENABLED
+MAX_SEARCH_RETRIES = CFG.MAX_SEARCH_RETRIES
+MAX_PARALLEL_SEARCHES = CFG.MAX_PARALLEL_SEARCHES
+PROMPT_HISTORY_CHAR_BUDGET = CFG.PROMPT_HISTORY_CHAR_BUDGET
+SEARCH_CONTEXT_CHAR_BUDGET = CFG.SEARCH_CONTEXT_CHAR_BUDGET
+
+PROXY_ENABLED = CFG.PROXY_ENABLED
 PROXY_LIST = []
-PROXY_FILE = ""
-
-# Maximum number of retries for DuckDuckGo searches
-MAX_SEARCH_RETRIES = int(os.getenv("MAX_SEARCH_RETRIES", "10"))
-
-# Time awareness settings
-DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "Europe/Istanbul")
-TIME_AWARENESS_ENABLED = os.getenv("TIME_AWARENESS_ENABLED", "true").lower() == "true"
-# Only show time information when relevant to the conversation
-SHOW_TIME_ONLY_WHEN_RELEVANT = os.getenv("SHOW_TIME_ONLY_WHEN_RELEVANT", "true").lower() == "true"
-
-# Website link settings
-# Only show website links when explicitly requested or relevant
-SHOW_LINKS_ONLY_WHEN_RELEVANT = os.getenv("SHOW_LINKS_ONLY_WHEN_RELEVANT", "true").lower() == "true"
-
-# Self-awareness and environmental awareness settings
-SELF_AWARENESS_ENABLED = os.getenv("SELF_AWARENESS_ENABLED", "true").lower() == "true"
-ENVIRONMENT_AWARENESS_ENABLED = os.getenv("ENVIRONMENT_AWARENESS_ENABLED", "true").lower() == "true"
-SELF_AWARENESS_SEARCH_ENABLED = os.getenv("SELF_AWARENESS_SEARCH_ENABLED", "true").lower() == "true"
-# Level of detail for environmental awareness (1-5)
-ENVIRONMENT_AWARENESS_LEVEL = int(os.getenv("ENVIRONMENT_AWARENESS_LEVEL", "3"))
-
-# Word translation settings - DISABLED as requested
-WORD_TRANSLATION_ENABLED = False
-# Default language for translation is German (kept for backward compatibility)
-DEFAULT_TRANSLATION_LANGUAGE = "German"
-# Translate words with A2 level and above (kept for backward compatibility)
-MIN_CEFR_LEVEL_FOR_TRANSLATION = "A2"
-# These settings are kept for backward compatibility but are not used
-MIN_WORD_LENGTH_FOR_TRANSLATION = int(os.getenv("MIN_WORD_LENGTH_FOR_TRANSLATION", "4"))
-MAX_WORDS_TO_TRANSLATE = int(os.getenv("MAX_WORDS_TO_TRANSLATE", "5"))
-
-# Dynamic message length settings - Her zaman etkin
-DYNAMIC_MESSAGE_LENGTH_ENABLED = True
-# Probability distribution for different response lengths
-# These values determine the approximate probability of each response type
-# Daha uzun ve insan gibi yanıt dağılımı - uzun yanıtlar için daha yüksek olasılık
-EXTREMELY_SHORT_RESPONSE_PROBABILITY = 0.05  # Çok kısa yanıtlar için düşük olasılık
-SLIGHTLY_SHORT_RESPONSE_PROBABILITY = 0.10  # Kısa yanıtlar için düşük olasılık
-MEDIUM_RESPONSE_PROBABILITY = 0.25  # Orta uzunlukta yanıtlar için orta olasılık
-SLIGHTLY_LONG_RESPONSE_PROBABILITY = 0.35  # Biraz uzun yanıtlar için yüksek olasılık
-LONG_RESPONSE_PROBABILITY = 0.25  # Uzun yanıtlar için yüksek olasılık
-# Randomness factor for response length (0.0-1.0, higher = more random)
-RESPONSE_LENGTH_RANDOMNESS = 0.7  # Doğal insan yanıtları için orta seviye rastgelelik
-
-# Slang and casual language settings
-SLANG_ENABLED = True  # Always enable slang and casual language
-# Probability of using slang in a response (0.0-1.0)
-SLANG_PROBABILITY = 1.0  # Maximum probability for natural slang usage
-# Maximum level of slang/swearing (1-5, where 5 is most casual/explicit)
-SLANG_LEVEL = 5  # Maximum level for natural casual/explicit language
-
-# Dynamic language level settings - Enabled with completely natural human-like distribution
-DYNAMIC_LANGUAGE_LEVEL_ENABLED = True
-# Probability distribution for different language levels (A1-C2)
-# Natural distribution like a real human - varies based on context and content
-A1_LANGUAGE_PROBABILITY = 0.15  # Simple language
-A2_LANGUAGE_PROBABILITY = 0.15  # Elementary language
-B1_LANGUAGE_PROBABILITY = 0.20  # Intermediate language
-B2_LANGUAGE_PROBABILITY = 0.20  # Upper-intermediate language
-C1_LANGUAGE_PROBABILITY = 0.15  # Advanced language
-C2_LANGUAGE_PROBABILITY = 0.15  # Proficient language
-# Randomness factor for language level (maximum for unpredictable human-like variation)
-LANGUAGE_LEVEL_RANDOMNESS = 1.0  # Maximum randomness for natural human-like unpredictability
-
-# Self-reflection settings - DISABLED
-SELF_REFLECTION_ENABLED = False
-# Probability of performing self-reflection on a response (0.0-1.0)
-SELF_REFLECTION_PROBABILITY = 0.0
-
-# Gemini model settings
-GEMINI_MODEL = "gemini-2.0-flash-lite"
-GEMINI_TEMPERATURE = 1.0  # Maximum temperature for ultra-creative, unpredictable, and human-like responses
-GEMINI_TOP_P = 0.99
-GEMINI_TOP_K = 80
-GEMINI_MAX_OUTPUT_TOKENS = 4096  # Increased max tokens to allow longer responses
-
-# Specialized Gemini models
-# Model for web search decision
-GEMINI_WEB_SEARCH_DECISION_MODEL = "gemini-2.5-flash-preview-04-17"  # Using the latest Gemini model for better decision making
-GEMINI_WEB_SEARCH_DECISION_TEMPERATURE = 0.1  # Low temperature for more deterministic decisions
-GEMINI_WEB_SEARCH_DECISION_TOP_P = 0.95
-GEMINI_WEB_SEARCH_DECISION_TOP_K = 32
-GEMINI_WEB_SEARCH_DECISION_MAX_OUTPUT_TOKENS = 8000
-
-# Model for web search and language detection
-GEMINI_FLASH_LITE_MODEL = "gemini-2.0-flash-lite"
-GEMINI_FLASH_LITE_TEMPERATURE = 0.4
-GEMINI_FLASH_LITE_TOP_P = 0.95
-GEMINI_FLASH_LITE_TOP_K = 32
-GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS = 8192
-
-# Model for image analysis
-GEMINI_IMAGE_MODEL = "gemini-2.5-pro-exp-03-25"
-GEMINI_IMAGE_TEMPERATURE = 0.7
-GEMINI_IMAGE_TOP_P = 0.95
-GEMINI_IMAGE_TOP_K = 40
-GEMINI_IMAGE_MAX_OUTPUT_TOKENS = 4096
-
-# Model for word translation
-GEMINI_TRANSLATION_MODEL = "gemini-2.0-flash-lite"
-GEMINI_TRANSLATION_TEMPERATURE = 0.1
-GEMINI_TRANSLATION_TOP_P = 0.95
-GEMINI_TRANSLATION_TOP_K = 40
-GEMINI_TRANSLATION_MAX_OUTPUT_TOKENS = 1024
+PROXY_FILE = CFG.PROXY_FILE
+
+DEFAULT_TIMEZONE = CFG.DEFAULT_TIMEZONE
+TIME_AWARENESS_ENABLED = CFG.TIME_AWARENESS_ENABLED
+SHOW_TIME_ONLY_WHEN_RELEVANT = CFG.SHOW_TIME_ONLY_WHEN_RELEVANT
+
+SHOW_LINKS_ONLY_WHEN_RELEVANT = CFG.SHOW_LINKS_ONLY_WHEN_RELEVANT
+
+SELF_AWARENESS_ENABLED = CFG.SELF_AWARENESS_ENABLED
+ENVIRONMENT_AWARENESS_ENABLED = CFG.ENVIRONMENT_AWARENESS_ENABLED
+SELF_AWARENESS_SEARCH_ENABLED = CFG.SELF_AWARENESS_SEARCH_ENABLED
+ENVIRONMENT_AWARENESS_LEVEL = CFG.ENVIRONMENT_AWARENESS_LEVEL
+
+WORD_TRANSLATION_ENABLED = CFG.WORD_TRANSLATION_ENABLED
+DEFAULT_TRANSLATION_LANGUAGE = CFG.DEFAULT_TRANSLATION_LANGUAGE
+MIN_CEFR_LEVEL_FOR_TRANSLATION = CFG.MIN_CEFR_LEVEL_FOR_TRANSLATION
+MIN_WORD_LENGTH_FOR_TRANSLATION = CFG.MIN_WORD_LENGTH_FOR_TRANSLATION
+MAX_WORDS_TO_TRANSLATE = CFG.MAX_WORDS_TO_TRANSLATE
+
+DYNAMIC_MESSAGE_LENGTH_ENABLED = CFG.DYNAMIC_MESSAGE_LENGTH_ENABLED
+EXTREMELY_SHORT_RESPONSE_PROBABILITY = CFG.EXTREMELY_SHORT_RESPONSE_PROBABILITY
+SLIGHTLY_SHORT_RESPONSE_PROBABILITY = CFG.SLIGHTLY_SHORT_RESPONSE_PROBABILITY
+MEDIUM_RESPONSE_PROBABILITY = CFG.MEDIUM_RESPONSE_PROBABILITY
+SLIGHTLY_LONG_RESPONSE_PROBABILITY = CFG.SLIGHTLY_LONG_RESPONSE_PROBABILITY
+LONG_RESPONSE_PROBABILITY = CFG.LONG_RESPONSE_PROBABILITY
+RESPONSE_LENGTH_RANDOMNESS = CFG.RESPONSE_LENGTH_RANDOMNESS
+
+SLANG_ENABLED = CFG.SLANG_ENABLED
+SLANG_PROBABILITY = CFG.SLANG_PROBABILITY
+SLANG_LEVEL = CFG.SLANG_LEVEL
+
+DYNAMIC_LANGUAGE_LEVEL_ENABLED = CFG.DYNAMIC_LANGUAGE_LEVEL_ENABLED
+A1_LANGUAGE_PROBABILITY = CFG.A1_LANGUAGE_PROBABILITY
+A2_LANGUAGE_PROBABILITY = CFG.A2_LANGUAGE_PROBABILITY
+B1_LANGUAGE_PROBABILITY = CFG.B1_LANGUAGE_PROBABILITY
+B2_LANGUAGE_PROBABILITY = CFG.B2_LANGUAGE_PROBABILITY
+C1_LANGUAGE_PROBABILITY = CFG.C1_LANGUAGE_PROBABILITY
+C2_LANGUAGE_PROBABILITY = CFG.C2_LANGUAGE_PROBABILITY
+LANGUAGE_LEVEL_RANDOMNESS = CFG.LANGUAGE_LEVEL_RANDOMNESS
+
+SELF_REFLECTION_ENABLED = CFG.SELF_REFLECTION_ENABLED
+SELF_REFLECTION_PROBABILITY = CFG.SELF_REFLECTION_PROBABILITY
+
+GEMINI_MODEL = CFG.GEMINI_MODEL
+GEMINI_TEMPERATURE = CFG.GEMINI_TEMPERATURE
+GEMINI_TOP_P = CFG.GEMINI_TOP_P
+GEMINI_TOP_K = CFG.GEMINI_TOP_K
+GEMINI_MAX_OUTPUT_TOKENS = CFG.GEMINI_MAX_OUTPUT_TOKENS
+
+GEMINI_WEB_SEARCH_DECISION_MODEL = CFG.GEMINI_WEB_SEARCH_DECISION_MODEL
+GEMINI_WEB_SEARCH_DECISION_TEMPERATURE = CFG.GEMINI_WEB_SEARCH_DECISION_TEMPERATURE
+GEMINI_WEB_SEARCH_DECISION_TOP_P = CFG.GEMINI_WEB_SEARCH_DECISION_TOP_P
+GEMINI_WEB_SEARCH_DECISION_TOP_K = CFG.GEMINI_WEB_SEARCH_DECISION_TOP_K
+GEMINI_WEB_SEARCH_DECISION_MAX_OUTPUT_TOKENS = CFG.GEMINI_WEB_SEARCH_DECISION_MAX_OUTPUT_TOKENS
+
+GEMINI_FLASH_LITE_MODEL = CFG.GEMINI_FLASH_LITE_MODEL
+GEMINI_FLASH_LITE_TEMPERATURE = CFG.GEMINI_FLASH_LITE_TEMPERATURE
+GEMINI_FLASH_LITE_TOP_P = CFG.GEMINI_FLASH_LITE_TOP_P
+GEMINI_FLASH_LITE_TOP_K = CFG.GEMINI_FLASH_LITE_TOP_K
+GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS = CFG.GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS
+
+GEMINI_IMAGE_MODEL = CFG.GEMINI_IMAGE_MODEL
+GEMINI_IMAGE_TEMPERATURE = CFG.GEMINI_IMAGE_TEMPERATURE
+GEMINI_IMAGE_TOP_P = CFG.GEMINI_IMAGE_TOP_P
+GEMINI_IMAGE_TOP_K = CFG.GEMINI_IMAGE_TOP_K
+GEMINI_IMAGE_MAX_OUTPUT_TOKENS = CFG.GEMINI_IMAGE_MAX_OUTPUT_TOKENS
+
+GEMINI_TRANSLATION_MODEL = CFG.GEMINI_TRANSLATION_MODEL
+GEMINI_TRANSLATION_TEMPERATURE = CFG.GEMINI_TRANSLATION_TEMPERATURE
+GEMINI_TRANSLATION_TOP_P = CFG.GEMINI_TRANSLATION_TOP_P
+GEMINI_TRANSLATION_TOP_K = CFG.GEMINI_TRANSLATION_TOP_K
+GEMINI_TRANSLATION_MAX_OUTPUT_TOKENS = CFG.GEMINI_TRANSLATION_MAX_OUTPUT_TOKENS
+
+def _gen_cfg(temperature: float, top_p: float, top_k: int, max_output_tokens: int) -> Mapping:
+    """Build a frozen generation-config mapping for a Gemini model profile"""
+    return MappingProxyType({
+        "temperature": temperature,
+        "top_p": top_p,
+        "top_k": top_k,
+        "max_output_tokens": max_output_tokens,
+    })
+
+
+# Per-model generation configs, built once so every Gemini call passes the
+# same interned mapping instead of rebuilding an identical dict per request
+GEMINI_GEN_CONFIG = _gen_cfg(
+    GEMINI_TEMPERATURE, GEMINI_TOP_P, GEMINI_TOP_K, GEMINI_MAX_OUTPUT_TOKENS)
+GEMINI_WEB_SEARCH_DECISION_GEN_CONFIG = _gen_cfg(
+    GEMINI_WEB_SEARCH_DECISION_TEMPERATURE, GEMINI_WEB_SEARCH_DECISION_TOP_P,
+    GEMINI_WEB_SEARCH_DECISION_TOP_K, GEMINI_WEB_SEARCH_DECISION_MAX_OUTPUT_TOKENS)
+GEMINI_FLASH_LITE_GEN_CONFIG = _gen_cfg(
+    GEMINI_FLASH_LITE_TEMPERATURE, GEMINI_FLASH_LITE_TOP_P,
+    GEMINI_FLASH_LITE_TOP_K, GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS)
+GEMINI_IMAGE_GEN_CONFIG = _gen_cfg(
+    GEMINI_IMAGE_TEMPERATURE, GEMINI_IMAGE_TOP_P,
+    GEMINI_IMAGE_TOP_K, GEMINI_IMAGE_MAX_OUTPUT_TOKENS)
+GEMINI_TRANSLATION_GEN_CONFIG = _gen_cfg(
+    GEMINI_TRANSLATION_TEMPERATURE, GEMINI_TRANSLATION_TOP_P,
+    GEMINI_TRANSLATION_TOP_K, GEMINI_TRANSLATION_MAX_OUTPUT_TOKENS)
+
+
+# Precomputed cumulative distributions for the weighted random selections.
+# Callers can pass these as cum_weights= (or bisect over them) instead of
+# re-accumulating the individual probabilities on every message.
+RESPONSE_LENGTH_CUM_WEIGHTS = tuple(itertools.accumulate((
+    EXTREMELY_SHORT_RESPONSE_PROBABILITY,
+    SLIGHTLY_SHORT_RESPONSE_PROBABILITY,
+    MEDIUM_RESPONSE_PROBABILITY,
+    SLIGHTLY_LONG_RESPONSE_PROBABILITY,
+    LONG_RESPONSE_PROBABILITY,
+)))
+LANGUAGE_LEVEL_CUM_WEIGHTS = tuple(itertools.accumulate((
+    A1_LANGUAGE_PROBABILITY,
+    A2_LANGUAGE_PROBABILITY,
+    B1_LANGUAGE_PROBABILITY,
+    B2_LANGUAGE_PROBABILITY,
+    C1_LANGUAGE_PROBABILITY,
+    C2_LANGUAGE_PROBABILITY,
+)))
+
+# Catch configuration drift early: both distributions should sum to ~1.0
+for _name, _cum in (("response length", RESPONSE_LENGTH_CUM_WEIGHTS),
+                    ("language level", LANGUAGE_LEVEL_CUM_WEIGHTS)):
+    if abs(_cum[-1] - 1.0) > 1e-6:
+        raise ValueError(f"{_name} probabilities sum to {_cum[-1]}, expected 1.0")
 
 # Safety settings - all set to BLOCK_NONE as requested
-SAFETY_SETTINGS = [
-    {
-        "category": "HARM_CATEGORY_HARASSMENT",
-        "threshold": "BLOCK_NONE"
-    },
-    {
-        "category": "HARM_CATEGORY_HATE_SPEECH",
-        "threshold": "BLOCK_NONE"
-    },
-    {
-        "category": "HARM_CATEGORY_SEXUALLY_EXPLICIT",
-        "threshold": "BLOCK_NONE"
-    },
-    {
-        "category": "HARM_CATEGORY_DANGEROUS_CONTENT",
-        "threshold": "BLOCK_NONE"
-    },
-]
+# Built once as an immutable tuple of plain dicts: the same objects are
+# passed to every Gemini call, so nothing is reallocated per request. The
+# elements must stay real dicts — the SDK's safety-setting normalization
+# only accepts dict or protos.SafetySetting items and rejects mappingproxy.
+SAFETY_SETTINGS = tuple(
+    {"category": category, "threshold": "BLOCK_NONE"}
+    for category in (
+        "HARM_CATEGORY_HARASSMENT",
+        "HARM_CATEGORY_HATE_SPEECH",
+        "HARM_CATEGORY_SEXUALLY_EXPLICIT",
+        "HARM_CATEGORY_DANGEROUS_CONTENT",
+    )
+)
@@ -44,7 +44,7 @@ async def generate_diverse_search_queries(user_query: str, chat_history: List[Di
         Ensure the queries cover different aspects, use different phrasings, and explore various related topics.
 
         Recent conversation:
-        {format_chat_history(chat_history[-5:] if len(chat_history) > 5 else chat_history)}
+        {format_chat_history(chat_history[-5:])}
 
         User's latest query: {user_query}
         User's language: {language}
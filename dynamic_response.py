@@ -1,23 +1,300 @@
+import bisect
+import functools
 import logging
-import random
-from typing import Dict, Any, Optional, Tuple
+import re
+import time
+from types import MappingProxyType
+from typing import Any, Dict, Final, Optional
+
+import numpy as np
+
 import config
 
 # Configure logging
 logger = logging.getLogger(__name__)
 
+# Response type buckets: fixed order shared by the probability vectors below
+_EXS, _SS, _MED, _SL, _LG = range(5)
+_NAMES_RESP = ("extremely_short", "slightly_short", "medium", "slightly_long", "long")
+
+# Language level buckets (A1..C2) in distribution order
+_A1, _A2, _B1, _B2, _C1, _C2 = range(6)
+_NAMES_LANG = ("A1", "A2", "B1", "B2", "C1", "C2")
+
+# Selection domains: both pipelines share the same sample/track engine and
+# keep their state side by side, indexed by these
+_RESP_DOMAIN, _LANG_DOMAIN = 0, 1
+
+# Precompiled indicator patterns: one linear regex scan per message replaces
+# a Python-level substring test per indicator
+_GREETING_RE = re.compile(r"^(?:hi|hello|hey|good (?:morning|afternoon|evening)|what's up|sup|yo)", re.IGNORECASE)
+_COMMAND_RE = re.compile(r"\b(?:please|can you|could you|would you|tell me|show me|help me|explain)\b", re.IGNORECASE)
+_TECH_RE = re.compile(r"\b(?:code|programming|science|philosophy|technology|engineering|mathematics)\b", re.IGNORECASE)
+_COMPLEX_RE = re.compile(
+    r"\b(?:however|therefore|furthermore|nevertheless|consequently"
+    r"|although|despite|whereas|moreover|subsequently)\b", re.IGNORECASE)
+_PUNCT_RE = re.compile(r"[.!?]")
+
+# Complexity scoring tables: each factor is bucketed against its thresholds
+# and the total score is mapped straight to a level
+_WORD_COUNT_THRESHOLDS = (10, 25)
+_WORD_LENGTH_THRESHOLDS = (4.0, 5.5)
+_SENTENCE_THRESHOLDS = (1, 3)
+_SCORE_THRESHOLDS = (5, 9)
+_COMPLEXITY_LEVELS = ("simple", "medium", "complex")
+
+# Every scoring factor saturates long before this many characters (25+ words
+# already lands in the top word bucket), so longer messages are truncated
+# before analysis instead of being scanned end to end
+_COMPLEXITY_SCAN_LIMIT = 1000
+
+# Rendered prompts are reused when the same (message, context) shows up again
+# within this window - generate_response classifies one message several times
+_PROMPT_CACHE_TTL = 60.0
+_PROMPT_CACHE_MAX = 1024
+
+# Repetition penalty min(0.3, 0.8**n) precomputed; clamped to 0.3 from n=6 on
+_REDUCTION = tuple(min(0.3, 0.8 ** i) for i in range(16))
+
+# Fixed weights for the random boost draws, stored as ready-made cumulative
+# distributions so a draw is one searchsorted instead of a Generator.choice
+_CUM_VARIETY = np.cumsum([0.2, 0.25, 0.3, 0.15, 0.1])  # match the base probabilities
+_CUM_RANDOM = np.cumsum([0.35, 0.30, 0.20, 0.10, 0.05])  # favor shorter responses
+
+# Variety steering: row i holds the multipliers applied when the last
+# selection was bucket i, replacing a branch per bucket
+_VARIETY_MUL = np.array([
+    [1.0, 2.0, 1.8, 1.2, 1.0],  # after extremely_short: favor slightly short / medium
+    [1.5, 1.0, 2.0, 1.2, 1.0],  # after slightly_short: favor medium / extremely short
+    [1.2, 1.8, 1.0, 1.8, 1.2],  # after medium: favor the neighbors
+    [1.0, 1.2, 1.8, 1.0, 1.5],  # after slightly_long: favor medium / long
+    [0.8, 1.2, 2.0, 1.5, 1.0],  # after long: favor medium / slightly long
+])
+_LANG_VARIETY_MUL = np.array([
+    [1.0, 1.0, 1.0, 2.0, 1.5, 1.0],  # after A1: favor more complex
+    [1.0, 1.0, 1.0, 2.0, 1.5, 1.0],  # after A2: favor more complex
+    [1.5, 1.0, 1.0, 1.0, 1.0, 1.5],  # after B1: favor the extremes
+    [1.5, 1.0, 1.0, 1.0, 1.0, 1.5],  # after B2: favor the extremes
+    [2.0, 1.8, 1.5, 1.0, 1.0, 1.0],  # after C1: favor simpler
+    [2.0, 1.8, 1.5, 1.0, 1.0, 1.0],  # after C2: favor simpler
+])
+
+# Content-based multipliers for response length, one vector per condition.
+# Each entry lines up with _NAMES_RESP; 1.0 leaves a bucket untouched.
+_RESP_SHORT_MSG = np.array([0.3, 0.5, 1.2, 1.8, 1.5])
+_RESP_MEDIUM_MSG = np.array([0.3, 0.5, 1.5, 2.0, 1.8])
+_RESP_LONG_MSG = np.array([0.1, 0.2, 0.8, 1.5, 3.0])
+_RESP_SIMPLE_QUESTION = np.array([0.3, 0.5, 1.5, 1.8, 1.2])
+_RESP_COMPLEX_QUESTION = np.array([0.2, 0.3, 1.0, 2.0, 2.5])
+_RESP_COMMAND = np.array([0.2, 0.3, 1.0, 2.0, 2.5])
+_RESP_GREETING = np.array([1.0, 1.5, 1.2, 0.8, 0.5])
+
+# Context-based multipliers for response length
+_RESP_FIRST_MESSAGE = np.array([0.1, 0.3, 1.0, 2.0, 3.0])
+_RESP_LONG_CONVERSATION = np.array([0.3, 0.5, 1.0, 1.5, 2.0])
+_RESP_HAS_MEDIA = np.array([0.1, 0.2, 0.5, 1.5, 3.0])
+
+# Content-based multipliers for language level, aligned with _NAMES_LANG
+_LANG_SIMPLE_MSG = np.array([1.8, 1.5, 1.0, 0.7, 0.5, 0.3])
+_LANG_MEDIUM_MSG = np.array([0.8, 1.3, 1.5, 1.3, 1.0, 0.7])
+_LANG_COMPLEX_MSG = np.array([0.6, 1.0, 1.2, 1.5, 1.3, 1.1])
+_LANG_COMPLEX_REPLY_SIMPLE = np.array([2.0, 1.5, 1.0, 1.0, 1.0, 1.0])
+_LANG_GREETING = np.array([3.0, 2.0, 1.2, 1.0, 0.3, 0.2])
+_LANG_QUESTION = np.array([1.0, 1.0, 1.5, 1.3, 1.0, 1.0])
+_LANG_SIMPLE_QUESTION = np.array([2.0, 1.5, 1.0, 1.0, 0.5, 0.3])
+_LANG_TECHNICAL = np.array([0.5, 0.7, 1.0, 1.3, 1.5, 1.2])
+
+# Context-based multipliers for language level
+_LANG_FIRST_MESSAGE = np.array([1.0, 1.5, 1.3, 1.0, 1.0, 0.7])
+_LANG_FIRST_MESSAGE_FORMAL = np.array([1.0, 1.0, 1.0, 1.5, 1.2, 1.0])
+_LANG_HAS_MEDIA = np.array([1.0, 1.0, 1.5, 1.3, 1.2, 1.0])
+
+# Language-level instructions in _NAMES_LANG order, keyed by the very same
+# string objects the selector returns so lookups compare by identity; the B1
+# text is its own constant because it doubles as the fallback
+_B1_INSTRUCTIONS: Final[str] = "Use moderately complex German with a good range of everyday vocabulary. Mix simple and compound sentences naturally. Include some subordinate clauses. Use different tenses as needed. Express opinions and give brief explanations. Use some idiomatic expressions. This is like how an intermediate German speaker would communicate - comfortable with everyday topics but still making occasional mistakes."
+_LEVEL_INSTRUCTIONS = MappingProxyType(dict(zip(_NAMES_LANG, (
+    "Use mostly simple German with basic vocabulary and grammar. Focus on everyday words and simple sentence structures. Use mainly present tense. Keep explanations brief and straightforward. This is like how a beginner would speak German, but still sound natural and human-like. Don't be robotic or overly simplified - real beginners still try to express complex thoughts with simple language.",
+    "Use simple but slightly more varied German. Include some basic connectors beyond 'und' and 'aber'. Use present tense primarily but occasionally include perfect tense for past events. Express basic opinions and preferences. Use vocabulary related to everyday situations and personal experiences. This is like how someone with elementary German knowledge would speak - simple but starting to become more expressive.",
+    _B1_INSTRUCTIONS,
+    "Use more complex German with a broader vocabulary. Construct varied sentence structures. Express opinions clearly with supporting details. Discuss abstract concepts with some limitations. Use different tenses and moods appropriately. Include idiomatic expressions naturally. This is like how an upper-intermediate German speaker would communicate - generally fluent but still with some limitations in nuance.",
+    "Use advanced German with rich vocabulary and varied expressions. Construct complex sentences with different subordinate clauses. Express nuanced opinions and develop arguments. Use precise vocabulary for specific contexts. Include cultural references and idiomatic expressions. This is like how an advanced German speaker would communicate - fluent and expressive with occasional minor errors.",
+    "Use sophisticated German with precise and varied vocabulary. Construct complex and elegant sentences. Express subtle nuances and develop detailed arguments. Use specialized terminology when appropriate. Include cultural references, wordplay, and idiomatic expressions naturally. This is like how a near-native German speaker would communicate - highly fluent and nuanced with rare errors.",
+))))
+# Known level codes; anything else falls back to B1 inside the table itself
+_VALID_LEVELS = frozenset(_LEVEL_INSTRUCTIONS)
+
+# Length instructions per response type, looked up instead of re-dispatching
+# through an if/elif chain on every message
+_RESP_DEFAULT_INSTRUCTIONS = "Tamamen doğal bir insan gibi yanıt ver. Mesaj uzunluğunu önceden planlamadan, doğal şekilde belirle. Detaylı ve kapsamlı yanıtlar ver. Gerçek bir insan gibi, konuyu derinlemesine açıkla. Normal bir sohbette konuşan biri gibi davran, doğal ve akıcı bir dil kullan."
+# Keys are taken from _NAMES_RESP itself so lookups with a selected name hit
+# the identity fast path of string comparison
+_RESP_INSTRUCTIONS = MappingProxyType(dict(zip(_NAMES_RESP, (
+    "Yanıtını KISA tut - 1-2 cümle. Gerçek bir insan gibi doğal bir şekilde yanıt ver. Temel bilgileri içer. Mesajlaşma uygulamasında doğal bir şekilde cevap veren biri gibi davran.",
+    "Yanıtını BİRAZ KISA tut - 2-3 cümle. Doğal bir şekilde mesajlaşan bir insan gibi yanıt ver. Temel bilgileri ve birkaç detay ver. Doğal ve akıcı konuş. Gerçek bir insan gibi, konuyu açıkla.",
+    "ORTA UZUNLUKTA bir yanıt ver - 3-5 cümle. Detaylı bilgiler ver. Normal bir sohbette konuşan biri gibi davran. Konuyu açıkla ve örnekler ver. Doğal bir akışla yanıt ver.",
+    "BİRAZ UZUN bir yanıt ver - 5-7 cümle. Detaylı bilgiler ve açıklamalar ver. Konuyu derinlemesine açıkla. Örnekler ve karşılaştırmalar kullan. Doğal bir insan gibi, akıcı ve bağlantılı cümleler kur.",
+    "UZUN ve DETAYLI bir yanıt ver - 7-10 cümle. Konuyu kapsamlı bir şekilde açıkla. Detaylı bilgiler, örnekler ve açıklamalar ver. Farklı bakış açıları sun. Doğal bir insan gibi, akıcı ve bağlantılı paragraflar oluştur. Konuyu derinlemesine ele al.",
+))))
+
+# Static halves of the response-length prompt block; the large Turkish tail
+# is one shared immutable object reused by every rendered prompt
+_LENGTH_PROMPT_HEAD: Final[str] = """
+        UZUN VE İNSAN GİBİ YANIT UZUNLUĞU TALİMATI:
+        """
+_LENGTH_PROMPT_TAIL: Final[str] = """
+
+        ÇOK ÖNEMLİ: Mesaj uzunluğunu tamamen doğal ve insan gibi belirle. Detaylı ve kapsamlı yanıtlar ver. Gerçek bir insan gibi, konuyu derinlemesine açıkla. Normal bir sohbette konuşan biri gibi davran, doğal ve akıcı bir dil kullan. Konuyu tam olarak anlatmak için yeterli uzunlukta cevaplar ver. Örnekler ve açıklamalar ekle. Birden fazla paragraf kullanmaktan çekinme. Konuyu farklı açılardan ele al. Detaylı ve bilgilendirici ol. Kısa ve yetersiz yanıtlardan kaçın. En az 5-7 cümle kullan. Akıcı ve bağlantılı paragraflar oluştur.
+        """
+
+
+@functools.lru_cache(maxsize=16)
+def _render_length_prompt(instructions: str) -> str:
+    """Render the full response-length prompt block for one instruction string"""
+    return "".join((_LENGTH_PROMPT_HEAD, instructions, _LENGTH_PROMPT_TAIL))
+
+
+# Static halves of the language-level prompt block; the renderer only joins
+# them around the instruction slot
+_LEVEL_PROMPT_PREFIX: Final[str] = """
+        NATURAL HUMAN-LIKE GERMAN LANGUAGE INSTRUCTION:
+        """
+_LEVEL_PROMPT_SUFFIX: Final[str] = """
+
+        EXTREMELY IMPORTANT: Speak German in a completely natural, human-like way. Your language level should be dynamic and unpredictable like a real human's.
+
+        NATURAL LANGUAGE GUIDELINES:
+        - Speak exactly like a real human would in casual conversation
+        - Let your language complexity vary naturally within a conversation
+        - Sometimes use simple language, sometimes more complex depending on the context
+        - Don't follow rigid rules about what words or grammar to use
+        - Occasionally make small grammar mistakes like real humans do
+        - Use natural sentence structures that vary in complexity
+        - Mix short and longer sentences like humans naturally do
+        - Sometimes use slang or colloquial expressions when appropriate
+        - Adjust your language complexity based on the topic and context
+        - Be unpredictable in your language patterns
+
+        IMPORTANT: Your language should NOT follow a consistent pattern or level. It should vary naturally like a real human's speech, with the general complexity level suggested above as just a starting point. Be dynamic and unpredictable in your language use.
+        """
+
+
+@functools.lru_cache(maxsize=16)
+def _render_level_prompt(instructions: str) -> str:
+    """Render the full language-level prompt block for one instruction string"""
+    return "".join((_LEVEL_PROMPT_PREFIX, instructions, _LEVEL_PROMPT_SUFFIX))
+
+
 class DynamicResponseManager:
     """
     Class to handle dynamic response length, language level, and style
     """
     def __init__(self):
         """Initialize the dynamic response manager"""
-        self.last_response_type = None
-        self.consecutive_same_type_count = 0
-        self.last_language_level = None
-        self.consecutive_same_level_count = 0
+        # Last selections tracked as bucket indices (-1 = nothing yet) so the
+        # hot path compares ints and indexes arrays instead of hashing strings,
+        # one slot per selection domain
+        self._last_idx = [-1, -1]
+        self._same_count = [0, 0]
+
+        # Snapshot the constant config probabilities once so the per-message
+        # path copies a ready-made vector instead of re-reading config attrs
+        self._base_response = np.array([
+            config.EXTREMELY_SHORT_RESPONSE_PROBABILITY,
+            config.SLIGHTLY_SHORT_RESPONSE_PROBABILITY,
+            config.MEDIUM_RESPONSE_PROBABILITY,
+            config.SLIGHTLY_LONG_RESPONSE_PROBABILITY,
+            config.LONG_RESPONSE_PROBABILITY,
+        ])
+        self._base_language = np.array([
+            config.A1_LANGUAGE_PROBABILITY,
+            config.A2_LANGUAGE_PROBABILITY,
+            config.B1_LANGUAGE_PROBABILITY,
+            config.B2_LANGUAGE_PROBABILITY,
+            config.C1_LANGUAGE_PROBABILITY,
+            config.C2_LANGUAGE_PROBABILITY,
+        ])
+        self._lang_randomness = config.LANGUAGE_LEVEL_RANDOMNESS
+
+        # Scratch vectors reused across messages; calls into each pipeline are
+        # serialized per manager, so one buffer per domain is enough
+        self._scratch_resp = np.empty_like(self._base_response)
+        self._scratch_lang = np.empty_like(self._base_language)
+
+        # Fully rendered prompt blocks, one per known selection, so the
+        # per-message formatters reduce to a dict lookup
+        self._length_prompts = {name: _render_length_prompt(text) for name, text in _RESP_INSTRUCTIONS.items()}
+        self._default_length_prompt = _render_length_prompt(_RESP_DEFAULT_INSTRUCTIONS)
+        self._level_prompts = {level: _render_level_prompt(text) for level, text in _LEVEL_INSTRUCTIONS.items()}
+
+        # Deterministic prompts for contentless messages (typing noise,
+        # emoji-only), where running the classifier is wasted work
+        self._default_length_prompt_empty = self._length_prompts["medium"]
+        self._default_level_prompt_empty = self._level_prompts["B1"]
+
+        # Short-lived cache of formatter results keyed on message and context,
+        # so repeat classifications within a burst reuse one prompt
+        self._prompt_cache: Dict[tuple, tuple] = {}
+
+        # One PCG64 generator shared by all draws in this manager
+        self._rng = np.random.default_rng()
+
         logger.info("Dynamic response manager initialized")
 
+    def _sample_index(self, probabilities: np.ndarray) -> int:
+        """
+        Normalize a probability vector and sample a bucket index from it
+
+        Args:
+            probabilities: The adjusted (unnormalized) probability vector
+
+        Returns:
+            The sampled bucket index
+        """
+        total = probabilities.sum()
+        if total > 0:
+            probabilities /= total
+
+        # Binary search against the cumulative distribution
+        idx = int(np.searchsorted(np.cumsum(probabilities), self._rng.random()))
+        return min(idx, probabilities.size - 1)
+
+    def _track(self, domain: int, idx: int) -> None:
+        """
+        Update the repetition counters for one selection domain
+
+        Args:
+            domain: _RESP_DOMAIN or _LANG_DOMAIN
+            idx: The bucket index that was just selected
+        """
+        if idx == self._last_idx[domain]:
+            self._same_count[domain] = min(self._same_count[domain] + 1, 15)
+        else:
+            self._same_count[domain] = 0
+            self._last_idx[domain] = idx
+
+    @staticmethod
+    def _prompt_key(kind: str, message_content: str, context: Optional[Dict[str, Any]]) -> tuple:
+        """Build a small stable cache key from a message and its context"""
+        if context:
+            return (kind, message_content, context.get("is_first_message"),
+                    context.get("message_count"), context.get("has_media"))
+        return (kind, message_content) + _CACHE_SENTINEL_CONTEXT
+
+    def _cached_prompt(self, kind: str, message_content: str, context: Optional[Dict[str, Any]]) -> Optional[str]:
+        """Return a recently rendered prompt for the same inputs, if any"""
+        entry = self._prompt_cache.get(self._prompt_key(kind, message_content, context))
+        if entry is not None and time.monotonic() - entry[0] < _PROMPT_CACHE_TTL:
+            return entry[1]
+        return None
+
+    def _store_prompt(self, kind: str, message_content: str, context: Optional[Dict[str, Any]], prompt: str) -> str:
+        """Remember a rendered prompt for a short while and return it"""
+        if len(self._prompt_cache) >= _PROMPT_CACHE_MAX:
+            self._prompt_cache.clear()
+        self._prompt_cache[self._prompt_key(kind, message_content, context)] = (time.monotonic(), prompt)
+        return prompt
+
     def get_response_type(self, message_content: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
         Determine the type of response to generate based on probabilities and context
@@ -32,14 +309,10 @@ class DynamicResponseManager:
         if not config.DYNAMIC_MESSAGE_LENGTH_ENABLED:
             return "medium"  # Default to medium if dynamic length is disabled
 
-        # Base probabilities from config
-        probabilities = {
-            "extremely_short": config.EXTREMELY_SHORT_RESPONSE_PROBABILITY,
-            "slightly_short": config.SLIGHTLY_SHORT_RESPONSE_PROBABILITY,
-            "medium": config.MEDIUM_RESPONSE_PROBABILITY,
-            "slightly_long": config.SLIGHTLY_LONG_RESPONSE_PROBABILITY,
-            "long": config.LONG_RESPONSE_PROBABILITY
-        }
+        # Base probabilities snapshotted from config at construction, copied
+        # into the reusable scratch buffer instead of a fresh allocation
+        probabilities = self._scratch_resp
+        np.copyto(probabilities, self._base_response)
 
         # Adjust probabilities based on message content
         self._adjust_probabilities_for_content(probabilities, message_content)
@@ -48,252 +321,150 @@ class DynamicResponseManager:
         if context:
             self._adjust_probabilities_for_context(probabilities, context)
 
-        # Adjust probabilities to avoid repetitive patterns
-        self._adjust_probabilities_for_variety(probabilities)
+        # Adjust probabilities to avoid repetitive patterns; skipped outright
+        # on the common path where the last type was not repeated
+        if self._same_count[_RESP_DOMAIN]:
+            self._adjust_probabilities_for_variety(probabilities)
 
-        # Apply randomness factor
-        self._apply_randomness(probabilities)
-
-        # Normalize probabilities
-        total = sum(probabilities.values())
-        normalized_probabilities = {k: v/total for k, v in probabilities.items()}
-
-        # Select response type based on probabilities
-        response_type = self._select_response_type(normalized_probabilities)
+        # Apply randomness factor; a forced winner decides the outcome outright
+        idx = self._apply_randomness(probabilities)
+        if idx is None:
+            idx = self._sample_index(probabilities)
+        response_type = _NAMES_RESP[idx]
 
         # Update tracking variables
-        if response_type == self.last_response_type:
-            self.consecutive_same_type_count += 1
-        else:
-            self.consecutive_same_type_count = 0
-            self.last_response_type = response_type
+        self._track(_RESP_DOMAIN, idx)
 
-        logger.debug(f"Selected response type: {response_type}")
+        logger.debug("Selected response type: %s", response_type)
         return response_type
 
-    def _adjust_probabilities_for_content(self, probabilities: Dict[str, float], message_content: str) -> None:
+    def _adjust_probabilities_for_content(self, probabilities: np.ndarray, message_content: str) -> None:
         """
         Adjust probabilities based on the user's message content to favor longer responses
 
         Args:
-            probabilities: The current probability distribution
+            probabilities: The current probability vector
             message_content: The user's message content
         """
+        # Scan the message once for the facts used by several checks below
+        msg_len = len(message_content)
+        has_question = "?" in message_content
+
         # Short messages get medium to long responses
-        if len(message_content) < 50:
-            probabilities["extremely_short"] *= 0.3  # Significantly reduced
-            probabilities["slightly_short"] *= 0.5  # Reduced
-            probabilities["medium"] *= 1.2  # Increased
-            probabilities["slightly_long"] *= 1.8  # Significantly increased
-            probabilities["long"] *= 1.5  # Increased
+        if msg_len < 50:
+            probabilities *= _RESP_SHORT_MSG
 
         # Medium messages get medium to long responses
-        elif len(message_content) < 100:
-            probabilities["extremely_short"] *= 0.3  # Significantly reduced
-            probabilities["slightly_short"] *= 0.5  # Reduced
-            probabilities["medium"] *= 1.5  # Increased
-            probabilities["slightly_long"] *= 2.0  # Significantly increased
-            probabilities["long"] *= 1.8  # Increased
+        elif msg_len < 100:
+            probabilities *= _RESP_MEDIUM_MSG
 
         # Long, complex messages get detailed long responses
-        elif len(message_content) > 200:
-            probabilities["extremely_short"] *= 0.1  # Greatly reduced
-            probabilities["slightly_short"] *= 0.2  # Significantly reduced
-            probabilities["medium"] *= 0.8  # Slightly reduced
-            probabilities["slightly_long"] *= 1.5  # Increased
-            probabilities["long"] *= 3.0  # Greatly increased
+        elif msg_len > 200:
+            probabilities *= _RESP_LONG_MSG
             # For complex messages, provide detailed responses
-            if random.random() < 0.7:  # High chance of long response
-                probabilities["long"] *= 2.0  # Boost for long responses
+            if self._rng.random() < 0.7:  # High chance of long response
+                probabilities[_LG] *= 2.0  # Boost for long responses
 
         # Questions get detailed responses
-        if "?" in message_content and len(message_content) < 60:
+        if has_question and msg_len < 60:
             # Simple questions get medium responses
-            probabilities["extremely_short"] *= 0.3  # Reduced extremely short
-            probabilities["slightly_short"] *= 0.5  # Reduced short
-            probabilities["medium"] *= 1.5  # Increased medium responses
-            probabilities["slightly_long"] *= 1.8  # Increased slightly long
-            probabilities["long"] *= 1.2  # Increased long responses
+            probabilities *= _RESP_SIMPLE_QUESTION
         # Complex questions get detailed responses
-        elif "?" in message_content:
-            probabilities["extremely_short"] *= 0.2  # Reduced extremely short
-            probabilities["slightly_short"] *= 0.3  # Reduced short
-            probabilities["medium"] *= 1.0  # No change
-            probabilities["slightly_long"] *= 2.0  # Significantly increased
-            probabilities["long"] *= 2.5  # Greatly increased
+        elif has_question:
+            probabilities *= _RESP_COMPLEX_QUESTION
             # Humans often give detailed answers to complex questions
-            if random.random() < 0.7:  # High chance of detailed response
-                probabilities["long"] *= 1.5  # Boost for long responses
+            if self._rng.random() < 0.7:  # High chance of detailed response
+                probabilities[_LG] *= 1.5  # Boost for long responses
 
         # Commands or requests get detailed responses
-        command_indicators = ["please", "can you", "could you", "would you", "tell me", "show me", "help me", "explain"]
-        if any(indicator in message_content.lower() for indicator in command_indicators):
-            probabilities["extremely_short"] *= 0.2  # Reduced extremely short
-            probabilities["slightly_short"] *= 0.3  # Reduced short
-            probabilities["medium"] *= 1.0  # No change
-            probabilities["slightly_long"] *= 2.0  # Significantly increased
-            probabilities["long"] *= 2.5  # Greatly increased
+        if _COMMAND_RE.search(message_content):
+            probabilities *= _RESP_COMMAND
 
         # Only greetings get shorter responses
-        greeting_indicators = ["hi", "hello", "hey", "good morning", "good afternoon", "good evening", "what's up", "sup", "yo"]
-        if any(message_content.lower().startswith(greeting) for greeting in greeting_indicators):
+        if _GREETING_RE.match(message_content):
             # But still not extremely short
-            probabilities["extremely_short"] *= 1.0  # No change
-            probabilities["slightly_short"] *= 1.5  # Increased
-            probabilities["medium"] *= 1.2  # Slightly increased
-            probabilities["slightly_long"] *= 0.8  # Slightly reduced
-            probabilities["long"] *= 0.5  # Reduced
+            probabilities *= _RESP_GREETING
 
-    def _adjust_probabilities_for_context(self, probabilities: Dict[str, float], context: Dict[str, Any]) -> None:
+    def _adjust_probabilities_for_context(self, probabilities: np.ndarray, context: Dict[str, Any]) -> None:
         """
         Adjust probabilities based on conversation context to favor longer responses
 
         Args:
-            probabilities: The current probability distribution
+            probabilities: The current probability vector
             context: Context information about the conversation
         """
         # If this is the first message in a conversation, provide a detailed introduction
         if context.get("is_first_message", False):
-            probabilities["extremely_short"] *= 0.1  # Greatly reduced
-            probabilities["slightly_short"] *= 0.3  # Significantly reduced
-            probabilities["medium"] *= 1.0  # No change
-            probabilities["slightly_long"] *= 2.0  # Significantly increased
-            probabilities["long"] *= 3.0  # Greatly increased
+            probabilities *= _RESP_FIRST_MESSAGE
 
         # If the conversation has been going on for a while, provide more detailed responses
         if context.get("message_count", 0) > 5:
-            probabilities["extremely_short"] *= 0.3  # Reduced
-            probabilities["slightly_short"] *= 0.5  # Reduced
-            probabilities["medium"] *= 1.0  # No change
-            probabilities["slightly_long"] *= 1.5  # Increased
-            probabilities["long"] *= 2.0  # Significantly increased
+            probabilities *= _RESP_LONG_CONVERSATION
 
         # If there's media, provide detailed descriptions
         if context.get("has_media", False):
-            probabilities["extremely_short"] *= 0.1  # Greatly reduced
-            probabilities["slightly_short"] *= 0.2  # Significantly reduced
-            probabilities["medium"] *= 0.5  # Reduced
-            probabilities["slightly_long"] *= 1.5  # Increased
-            probabilities["long"] *= 3.0  # Greatly increased
+            probabilities *= _RESP_HAS_MEDIA
 
-    def _adjust_probabilities_for_variety(self, probabilities: Dict[str, float]) -> None:
+    def _adjust_probabilities_for_variety(self, probabilities: np.ndarray) -> None:
         """
         Adjust probabilities to avoid repetitive patterns
 
         Args:
-            probabilities: The current probability distribution
-        """
-        # If we've had the same response type multiple times in a row, reduce its probability
-        if self.consecutive_same_type_count > 0 and self.last_response_type:
-            # More aggressive reduction to avoid repetition
-            reduction_factor = min(0.3, 0.8 ** self.consecutive_same_type_count)
-            probabilities[self.last_response_type] *= reduction_factor
-
-            # Create natural variation in response length
-            if self.consecutive_same_type_count >= 1:
-                # If we've been giving extremely short responses, favor slightly short and medium
-                if self.last_response_type == "extremely_short":
-                    probabilities["slightly_short"] *= 2.0
-                    probabilities["medium"] *= 1.8
-                    probabilities["slightly_long"] *= 1.2
-                    # Still allow some extremely short responses for natural variation
-                    if random.random() < 0.3:
-                        probabilities["extremely_short"] *= 0.8
-
-                # If we've been giving slightly short responses, favor medium and extremely short
-                elif self.last_response_type == "slightly_short":
-                    probabilities["medium"] *= 2.0
-                    probabilities["extremely_short"] *= 1.5
-                    probabilities["slightly_long"] *= 1.2
-
-                # If we've been giving medium responses, favor slightly short and slightly long
-                elif self.last_response_type == "medium":
-                    probabilities["slightly_short"] *= 1.8
-                    probabilities["slightly_long"] *= 1.8
-                    probabilities["extremely_short"] *= 1.2
-                    probabilities["long"] *= 1.2
-
-                # If we've been giving slightly long responses, favor medium and long
-                elif self.last_response_type == "slightly_long":
-                    probabilities["medium"] *= 1.8
-                    probabilities["long"] *= 1.5
-                    probabilities["slightly_short"] *= 1.2
-
-                # If we've been giving long responses, favor medium and slightly long
-                elif self.last_response_type == "long":
-                    probabilities["medium"] *= 2.0
-                    probabilities["slightly_long"] *= 1.5
-                    probabilities["slightly_short"] *= 1.2
-                    probabilities["extremely_short"] *= 0.8  # Reduce but don't eliminate
-
-            # Occasionally introduce completely random variation for more natural patterns
-            if random.random() < 0.15:  # Reduced from 0.2
-                # Choose a random response type with weighted probability
-                response_types = list(probabilities.keys())
-                weights = [0.2, 0.25, 0.3, 0.15, 0.1]  # Match our base probabilities
-                random_type = random.choices(response_types, weights=weights, k=1)[0]
-                # Boost its probability moderately
-                probabilities[random_type] *= 2.5  # Reduced from 4.0
-
-    def _apply_randomness(self, probabilities: Dict[str, float]) -> None:
+            probabilities: The current probability vector
         """
-        Apply extreme randomness factor to probabilities for completely unpredictable response lengths
+        # The caller only invokes this when the same response type repeated,
+        # so the repetition reduction applies unconditionally
+        last_idx = self._last_idx[_RESP_DOMAIN]
 
-        Args:
-            probabilities: The current probability distribution
-        """
-        # Maksimum randomness (1.0) kullanarak tamamen öngörülemez yanıt uzunlukları oluştur
-        randomness = 1.0  # Her zaman maksimum randomness kullan
-        for key in probabilities:
-            # Daha geniş bir aralıkta rastgele ayarlama uygula
-            random_adjustment = 1.0 + randomness * (random.random() * 4 - 2.0)  # -2.0 ile 2.0 arasında değişim
-            probabilities[key] *= random_adjustment
+        # More aggressive reduction to avoid repetition
+        reduction_factor = _REDUCTION[self._same_count[_RESP_DOMAIN]]
+        probabilities[last_idx] *= reduction_factor
 
-        # Daha sık olarak tamamen rastgele bir yanıt türünü seç ve olasılığını büyük ölçüde artır
-        if random.random() < 0.5:  # %50 olasılıkla
-            # Kısa yanıtlara daha fazla ağırlık ver
-            weights = [0.35, 0.30, 0.20, 0.10, 0.05]  # Kısa yanıtlara daha yüksek ağırlık
-            response_types = list(probabilities.keys())
-            random_key = random.choices(response_types, weights=weights, k=1)[0]
-            probabilities[random_key] *= random.uniform(3.0, 8.0)  # 3-8 kat artış
+        # Create natural variation in response length: one vector multiply
+        # steering away from the repeated bucket
+        np.multiply(probabilities, _VARIETY_MUL[last_idx], out=probabilities)
 
-        # Bazen de tamamen rastgele bir yanıt türünü seçerek gerçek insan davranışını taklit et
-        if random.random() < 0.2:  # %20 olasılıkla
-            # Tüm olasılıkları sıfırla ve sadece bir yanıt türünü seç
-            for key in probabilities:
-                probabilities[key] = 0.001  # Çok düşük bir değer
-            random_key = random.choice(list(probabilities.keys()))
-            probabilities[random_key] = 1.0  # Seçilen yanıt türünü garantile
+        # Still allow some extremely short responses for natural variation
+        if last_idx == _EXS and self._rng.random() < 0.3:
+            probabilities[_EXS] *= 0.8
+
+        # Occasionally introduce completely random variation for more natural patterns
+        if self._rng.random() < 0.15:  # Reduced from 0.2
+            # Choose a random response type with weighted probability
+            random_idx = int(np.searchsorted(_CUM_VARIETY, self._rng.random()))
+            # Boost its probability moderately
+            probabilities[random_idx] *= 2.5  # Reduced from 4.0
 
-    def _select_response_type(self, probabilities: Dict[str, float]) -> str:
+    def _apply_randomness(self, probabilities: np.ndarray) -> Optional[int]:
         """
-        Select a response type based on the probability distribution
+        Apply extreme randomness factor to probabilities for completely unpredictable response lengths
 
         Args:
-            probabilities: The normalized probability distribution
+            probabilities: The current probability vector
 
         Returns:
-            Selected response type
+            The index of a forced winner when the fully random branch fires
+            (the caller can skip normalization and selection), otherwise None
         """
-        # Convert probabilities to cumulative distribution
-        items = list(probabilities.items())
-        cumulative_prob = 0
-        cumulative_probs = []
+        # Maksimum randomness (1.0) ile tüm vektörü tek seferde ayarla:
+        # 1.0 + (r * 4 - 2.0) == 4r - 1, yani -1.0 ile 3.0 arasında değişim
+        probabilities *= self._rng.random(probabilities.size) * 4.0 - 1.0
 
-        for item, prob in items:
-            cumulative_prob += prob
-            cumulative_probs.append((item, cumulative_prob))
+        # Daha sık olarak tamamen rastgele bir yanıt türünü seç ve olasılığını büyük ölçüde artır
+        if self._rng.random() < 0.5:  # %50 olasılıkla
+            # Kısa yanıtlara daha fazla ağırlık ver
+            random_idx = int(np.searchsorted(_CUM_RANDOM, self._rng.random()))
+            probabilities[random_idx] *= self._rng.uniform(3.0, 8.0)  # 3-8 kat artış
 
-        # Select based on random value
-        rand_val = random.random()
-        for item, cum_prob in cumulative_probs:
-            if rand_val <= cum_prob:
-                return item
+        # Bazen de tamamen rastgele bir yanıt türünü seçerek gerçek insan davranışını taklit et
+        if self._rng.random() < 0.2:  # %20 olasılıkla
+            # Seçilen yanıt türünü garantile: normalizasyon ve seçim atlanabilir
+            return int(self._rng.integers(probabilities.size))
 
-        # Fallback to medium if something goes wrong
-        return "medium"
+        return None
 
-    def get_response_length_instructions(self, response_type: str) -> str:
+    @staticmethod
+    def get_response_length_instructions(response_type: str) -> str:
         """
         Get specific instructions for the selected response length
 
@@ -304,19 +475,24 @@ class DynamicResponseManager:
             Instructions for the model to generate a response of the appropriate length
         """
         # Yanıt türüne göre farklı talimatlar ver, daha uzun ve insan gibi yanıtlar için
-        if response_type == "extremely_short":
-            return "Yanıtını KISA tut - 1-2 cümle. Gerçek bir insan gibi doğal bir şekilde yanıt ver. Temel bilgileri içer. Mesajlaşma uygulamasında doğal bir şekilde cevap veren biri gibi davran."
-        elif response_type == "slightly_short":
-            return "Yanıtını BİRAZ KISA tut - 2-3 cümle. Doğal bir şekilde mesajlaşan bir insan gibi yanıt ver. Temel bilgileri ve birkaç detay ver. Doğal ve akıcı konuş. Gerçek bir insan gibi, konuyu açıkla."
-        elif response_type == "medium":
-            return "ORTA UZUNLUKTA bir yanıt ver - 3-5 cümle. Detaylı bilgiler ver. Normal bir sohbette konuşan biri gibi davran. Konuyu açıkla ve örnekler ver. Doğal bir akışla yanıt ver."
-        elif response_type == "slightly_long":
-            return "BİRAZ UZUN bir yanıt ver - 5-7 cümle. Detaylı bilgiler ve açıklamalar ver. Konuyu derinlemesine açıkla. Örnekler ve karşılaştırmalar kullan. Doğal bir insan gibi, akıcı ve bağlantılı cümleler kur."
-        elif response_type == "long":
-            return "UZUN ve DETAYLI bir yanıt ver - 7-10 cümle. Konuyu kapsamlı bir şekilde açıkla. Detaylı bilgiler, örnekler ve açıklamalar ver. Farklı bakış açıları sun. Doğal bir insan gibi, akıcı ve bağlantılı paragraflar oluştur. Konuyu derinlemesine ele al."
-        else:
-            # Default instruction - doğal ve insan gibi
-            return "Tamamen doğal bir insan gibi yanıt ver. Mesaj uzunluğunu önceden planlamadan, doğal şekilde belirle. Detaylı ve kapsamlı yanıtlar ver. Gerçek bir insan gibi, konuyu derinlemesine açıkla. Normal bir sohbette konuşan biri gibi davran, doğal ve akıcı bir dil kullan."
+        return _RESP_INSTRUCTIONS.get(response_type, _RESP_DEFAULT_INSTRUCTIONS)
+
+    def get_response_and_instructions(self, message_content: str, context: Optional[Dict[str, Any]] = None) -> tuple:
+        """
+        Select a response type and return it together with its length instructions
+
+        Fused entry point for callers that need both, avoiding a second
+        method call and instruction lookup per message.
+
+        Args:
+            message_content: The user's message content
+            context: Optional context information about the conversation
+
+        Returns:
+            Tuple of (response_type, instructions)
+        """
+        response_type = self.get_response_type(message_content, context)
+        return response_type, _RESP_INSTRUCTIONS.get(response_type, _RESP_DEFAULT_INSTRUCTIONS)
 
     def get_language_level(self, message_content: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -329,15 +505,10 @@ class DynamicResponseManager:
         Returns:
             Selected language level based on dynamic probabilities
         """
-        # Base probabilities from config
-        probabilities = {
-            "A1": config.A1_LANGUAGE_PROBABILITY,
-            "A2": config.A2_LANGUAGE_PROBABILITY,
-            "B1": config.B1_LANGUAGE_PROBABILITY,
-            "B2": config.B2_LANGUAGE_PROBABILITY,
-            "C1": config.C1_LANGUAGE_PROBABILITY,
-            "C2": config.C2_LANGUAGE_PROBABILITY
-        }
+        # Base probabilities snapshotted from config at construction, copied
+        # into the reusable scratch buffer instead of a fresh allocation
+        probabilities = self._scratch_lang
+        np.copyto(probabilities, self._base_language)
 
         # Adjust probabilities based on message content
         self._adjust_language_probabilities_for_content(probabilities, message_content)
@@ -346,38 +517,28 @@ class DynamicResponseManager:
         if context:
             self._adjust_language_probabilities_for_context(probabilities, context)
 
-        # Adjust probabilities to avoid repetitive patterns
-        self._adjust_language_probabilities_for_variety(probabilities)
+        # Adjust probabilities to avoid repetitive patterns; skipped outright
+        # on the common path where the last level was not repeated
+        if self._same_count[_LANG_DOMAIN]:
+            self._adjust_language_probabilities_for_variety(probabilities)
 
         # Apply randomness factor
         self._apply_language_randomness(probabilities)
 
-        # Normalize probabilities
-        total = sum(probabilities.values())
-        if total > 0:
-            for key in probabilities:
-                probabilities[key] /= total
-
-        # Select language level based on probabilities
-        selected_level = self._select_language_level(probabilities)
-
-        # Update tracking variables
-        if selected_level == self.last_language_level:
-            self.consecutive_same_level_count += 1
-        else:
-            self.consecutive_same_level_count = 0
-
-        self.last_language_level = selected_level
+        # Sample the level and update tracking through the shared engine
+        idx = self._sample_index(probabilities)
+        selected_level = _NAMES_LANG[idx]
+        self._track(_LANG_DOMAIN, idx)
 
-        logger.debug(f"Using {selected_level} language level for natural human-like communication")
+        logger.debug("Using %s language level for natural human-like communication", selected_level)
         return selected_level
 
-    def _adjust_language_probabilities_for_content(self, probabilities: Dict[str, float], message_content: str) -> None:
+    def _adjust_language_probabilities_for_content(self, probabilities: np.ndarray, message_content: str) -> None:
         """
         Adjust probabilities based on the user's message content
 
         Args:
-            probabilities: The current probability distribution
+            probabilities: The current probability vector
             message_content: The user's message content
         """
         # Analyze message complexity
@@ -386,79 +547,50 @@ class DynamicResponseManager:
         # Match language level to message complexity but maintain natural variation
         if message_complexity == "simple":
             # Simple messages tend toward simpler responses, but with natural variation
-            probabilities["A1"] *= 1.8
-            probabilities["A2"] *= 1.5
-            probabilities["B1"] *= 1.0  # No change
-            probabilities["B2"] *= 0.7
-            probabilities["C1"] *= 0.5
-            probabilities["C2"] *= 0.3
+            probabilities *= _LANG_SIMPLE_MSG
             # But sometimes use more complex language even for simple messages (like humans do)
-            if random.random() < 0.15:
-                random_level = random.choice(["B2", "C1"])
-                probabilities[random_level] *= 2.0
+            if self._rng.random() < 0.15:
+                random_idx = int(self._rng.integers(_B2, _C1 + 1))
+                probabilities[random_idx] *= 2.0
         elif message_complexity == "medium":
             # Medium complexity gets varied responses with focus on mid-levels
-            probabilities["A2"] *= 1.3
-            probabilities["B1"] *= 1.5
-            probabilities["B2"] *= 1.3
-            probabilities["A1"] *= 0.8
-            probabilities["C2"] *= 0.7
+            probabilities *= _LANG_MEDIUM_MSG
             # Sometimes use very simple or very complex language (like humans do)
-            if random.random() < 0.2:
-                if random.random() < 0.5:
-                    probabilities["A1"] *= 2.0  # Sometimes very simple
+            if self._rng.random() < 0.2:
+                if self._rng.random() < 0.5:
+                    probabilities[_A1] *= 2.0  # Sometimes very simple
                 else:
-                    probabilities["C1"] *= 2.0  # Sometimes very complex
+                    probabilities[_C1] *= 2.0  # Sometimes very complex
         elif message_complexity == "complex":
             # Complex messages can get more sophisticated responses
-            probabilities["B1"] *= 1.2
-            probabilities["B2"] *= 1.5
-            probabilities["C1"] *= 1.3
-            probabilities["C2"] *= 1.1
-            probabilities["A1"] *= 0.6
+            probabilities *= _LANG_COMPLEX_MSG
             # But humans sometimes respond to complex messages with simple language
-            if random.random() < 0.25:
-                probabilities["A1"] *= 2.0
-                probabilities["A2"] *= 1.5
+            if self._rng.random() < 0.25:
+                probabilities *= _LANG_COMPLEX_REPLY_SIMPLE
 
         # Add some unpredictability - sometimes completely ignore message complexity
-        if random.random() < 0.1:
+        if self._rng.random() < 0.1:
             # Reset all adjustments and boost a random level
-            for level in probabilities:
-                probabilities[level] = getattr(config, f"{level}_LANGUAGE_PROBABILITY")
+            np.copyto(probabilities, self._base_language)
 
             # Boost a random level
-            random_level = random.choice(list(probabilities.keys()))
-            probabilities[random_level] *= 3.0
+            random_idx = int(self._rng.integers(probabilities.size))
+            probabilities[random_idx] *= 3.0
 
         # Greetings often get simple responses
-        greeting_indicators = ["hi", "hello", "hey", "good morning", "good afternoon", "good evening", "what's up", "sup", "yo"]
-        if any(message_content.lower().startswith(greeting) for greeting in greeting_indicators):
-            probabilities["A1"] *= 3.0
-            probabilities["A2"] *= 2.0
-            probabilities["B1"] *= 1.2
-            probabilities["C1"] *= 0.3
-            probabilities["C2"] *= 0.2
+        if _GREETING_RE.match(message_content):
+            probabilities *= _LANG_GREETING
 
         # Questions often get mid-level responses
         if "?" in message_content:
-            probabilities["B1"] *= 1.5
-            probabilities["B2"] *= 1.3
+            probabilities *= _LANG_QUESTION
             # But simple questions get simple answers
             if len(message_content) < 60:
-                probabilities["A1"] *= 2.0
-                probabilities["A2"] *= 1.5
-                probabilities["C1"] *= 0.5
-                probabilities["C2"] *= 0.3
+                probabilities *= _LANG_SIMPLE_QUESTION
 
         # Technical or specialized topics might get more complex language
-        technical_indicators = ["code", "programming", "science", "philosophy", "technology", "engineering", "mathematics"]
-        if any(indicator in message_content.lower() for indicator in technical_indicators):
-            probabilities["B2"] *= 1.3
-            probabilities["C1"] *= 1.5
-            probabilities["C2"] *= 1.2
-            probabilities["A1"] *= 0.5
-            probabilities["A2"] *= 0.7
+        if _TECH_RE.search(message_content):
+            probabilities *= _LANG_TECHNICAL
 
     def _estimate_message_complexity(self, message: str) -> str:
         """
@@ -470,176 +602,111 @@ class DynamicResponseManager:
         Returns:
             Complexity level: "simple", "medium", or "complex"
         """
+        # Cap the work for very long messages; the score is already maxed out
+        if len(message) > _COMPLEXITY_SCAN_LIMIT:
+            message = message[:_COMPLEXITY_SCAN_LIMIT]
+
         # Simple heuristics for message complexity
         words = message.split()
         word_count = len(words)
-        avg_word_length = sum(len(word) for word in words) / max(1, word_count)
-        sentence_count = message.count('.') + message.count('!') + message.count('?')
-
-        # Complex sentence indicators
-        complex_indicators = ["however", "therefore", "furthermore", "nevertheless", "consequently",
-                             "although", "despite", "whereas", "moreover", "subsequently"]
-        complex_indicator_count = sum(1 for indicator in complex_indicators if indicator in message.lower())
-
-        # Calculate complexity score
-        complexity_score = 0
-
-        # Length factors
-        if word_count < 10:
-            complexity_score += 1
-        elif word_count < 25:
-            complexity_score += 2
-        else:
-            complexity_score += 3
-
-        # Word length factor
-        if avg_word_length < 4:
-            complexity_score += 1
-        elif avg_word_length < 5.5:
-            complexity_score += 2
+        avg_word_length = sum(map(len, words)) / max(1, word_count)
+        # One scan for sentence-ending punctuation; for very short messages
+        # the three C-level count() calls beat the regex's fixed overhead
+        if len(message) < 50:
+            sentence_count = message.count('.') + message.count('!') + message.count('?')
         else:
-            complexity_score += 3
+            sentence_count = len(_PUNCT_RE.findall(message))
 
-        # Sentence structure factor
-        if sentence_count <= 1:
-            complexity_score += 1
-        elif sentence_count <= 3:
-            complexity_score += 2
-        else:
-            complexity_score += 3
+        # Complex sentence indicators, found in one scan
+        complex_indicator_count = len(_COMPLEX_RE.findall(message))
 
-        # Complex indicators factor
-        complexity_score += min(3, complex_indicator_count)
+        # Bucket each factor (1-3) against its thresholds instead of branching
+        complexity_score = (
+            bisect.bisect_right(_WORD_COUNT_THRESHOLDS, word_count) + 1
+            + bisect.bisect_right(_WORD_LENGTH_THRESHOLDS, avg_word_length) + 1
+            + bisect.bisect_left(_SENTENCE_THRESHOLDS, sentence_count) + 1
+            + min(3, complex_indicator_count)
+        )
 
-        # Determine complexity level
-        if complexity_score <= 5:
-            return "simple"
-        elif complexity_score <= 9:
-            return "medium"
-        else:
-            return "complex"
+        # Map the total score straight to a complexity level; the score
+        # thresholds are inclusive (<= 5 simple, <= 9 medium), so bisect_left
+        return _COMPLEXITY_LEVELS[bisect.bisect_left(_SCORE_THRESHOLDS, complexity_score)]
 
-    def _adjust_language_probabilities_for_context(self, probabilities: Dict[str, float], context: Dict[str, Any]) -> None:
+    def _adjust_language_probabilities_for_context(self, probabilities: np.ndarray, context: Dict[str, Any]) -> None:
         """
         Adjust probabilities based on conversation context
 
         Args:
-            probabilities: The current probability distribution
+            probabilities: The current probability vector
             context: Context information about the conversation
         """
         # If this is the first message in a conversation, tend toward middle levels
         if context.get("is_first_message", False):
             # First messages often set the tone - use a more balanced approach
-            probabilities["A2"] *= 1.5
-            probabilities["B1"] *= 1.3
-            probabilities["A1"] *= 1.0  # No change
-            probabilities["C2"] *= 0.7
+            probabilities *= _LANG_FIRST_MESSAGE
 
             # First messages sometimes get more formal/complex language
-            if random.random() < 0.2:
-                probabilities["B2"] *= 1.5
-                probabilities["C1"] *= 1.2
+            if self._rng.random() < 0.2:
+                probabilities *= _LANG_FIRST_MESSAGE_FORMAL
 
         # If the conversation has been going on for a while, vary more
         message_count = context.get("message_count", 0)
         if message_count > 5:
             # Increase randomness as conversation progresses
-            random_boost = random.choice(["A1", "A2", "B1", "B2", "C1", "C2"])
-            probabilities[random_boost] *= 1.5
+            random_idx = int(self._rng.integers(probabilities.size))
+            probabilities[random_idx] *= 1.5
 
             # Occasionally make a dramatic shift in language level
-            if message_count > 10 and random.random() < 0.15:
-                # Reset all probabilities
-                for level in probabilities:
-                    probabilities[level] = 0.1
-
-                # Pick a random level to dominate
-                dominant_level = random.choice(["A1", "A2", "B1", "B2", "C1", "C2"])
-                probabilities[dominant_level] = 0.6
+            if message_count > 10 and self._rng.random() < 0.15:
+                # Reset all probabilities and pick a random level to dominate
+                probabilities[:] = 0.1
+                dominant_idx = int(self._rng.integers(probabilities.size))
+                probabilities[dominant_idx] = 0.6
 
         # If there's media, sometimes use more descriptive language
-        if context.get("has_media", False) and random.random() < 0.4:
-            probabilities["B1"] *= 1.5
-            probabilities["B2"] *= 1.3
-            probabilities["C1"] *= 1.2
+        if context.get("has_media", False) and self._rng.random() < 0.4:
+            probabilities *= _LANG_HAS_MEDIA
 
         # Add some unpredictability - sometimes completely ignore context
-        if random.random() < 0.1:
+        if self._rng.random() < 0.1:
             # Boost a random level significantly
-            random_level = random.choice(list(probabilities.keys()))
-            probabilities[random_level] *= 3.0
+            random_idx = int(self._rng.integers(probabilities.size))
+            probabilities[random_idx] *= 3.0
 
-    def _adjust_language_probabilities_for_variety(self, probabilities: Dict[str, float]) -> None:
+    def _adjust_language_probabilities_for_variety(self, probabilities: np.ndarray) -> None:
         """
         Adjust language level probabilities to avoid repetitive patterns
 
         Args:
-            probabilities: The current probability distribution
-        """
-        # If we've had the same language level multiple times in a row, reduce its probability
-        if self.consecutive_same_level_count > 0 and self.last_language_level:
-            # More aggressive reduction to avoid repetition
-            reduction_factor = min(0.3, 0.8 ** self.consecutive_same_level_count)
-            probabilities[self.last_language_level] *= reduction_factor
-
-            # Force a change in language level more frequently
-            if self.consecutive_same_level_count >= 2 and random.random() < 0.7:
-                # If we've been using simple language, favor more complex
-                if self.last_language_level in ["A1", "A2"]:
-                    probabilities["B2"] *= 2.0
-                    probabilities["C1"] *= 1.5
-                # If we've been using mid-level language, favor extremes
-                elif self.last_language_level in ["B1", "B2"]:
-                    probabilities["A1"] *= 1.5
-                    probabilities["C2"] *= 1.5
-                # If we've been using complex language, favor simpler
-                elif self.last_language_level in ["C1", "C2"]:
-                    probabilities["A1"] *= 2.0
-                    probabilities["A2"] *= 1.8
-                    probabilities["B1"] *= 1.5
-
-    def _apply_language_randomness(self, probabilities: Dict[str, float]) -> None:
+            probabilities: The current probability vector
         """
-        Apply randomness factor to language level probabilities
+        # The caller only invokes this when the same language level repeated,
+        # so the repetition reduction applies unconditionally
+        last_idx = self._last_idx[_LANG_DOMAIN]
 
-        Args:
-            probabilities: The current probability distribution
-        """
-        randomness = config.LANGUAGE_LEVEL_RANDOMNESS
-        for key in probabilities:
-            # Apply random adjustment within the randomness factor range
-            random_adjustment = 1.0 + randomness * (random.random() * 2 - 1)
-            probabilities[key] *= random_adjustment
+        # More aggressive reduction to avoid repetition
+        reduction_factor = _REDUCTION[self._same_count[_LANG_DOMAIN]]
+        probabilities[last_idx] *= reduction_factor
+
+        # Force a change in language level more frequently: one vector
+        # multiply steering away from the repeated band
+        if self._same_count[_LANG_DOMAIN] >= 2 and self._rng.random() < 0.7:
+            np.multiply(probabilities, _LANG_VARIETY_MUL[last_idx], out=probabilities)
 
-    def _select_language_level(self, probabilities: Dict[str, float]) -> str:
+    def _apply_language_randomness(self, probabilities: np.ndarray) -> None:
         """
-        Select a language level based on the probability distribution
+        Apply randomness factor to language level probabilities
 
         Args:
-            probabilities: The normalized probability distribution
-
-        Returns:
-            Selected language level
+            probabilities: The current probability vector
         """
-        # Convert probabilities to cumulative distribution
-        items = list(probabilities.items())
-        cumulative_prob = 0
-        cumulative_probs = []
-
-        for item, prob in items:
-            cumulative_prob += prob
-            cumulative_probs.append((item, cumulative_prob))
+        # Apply random adjustments within the randomness factor range, batched
+        # into one draw and one vectorized multiply
+        randomness = self._lang_randomness
+        probabilities *= 1.0 + randomness * (self._rng.random(probabilities.size) * 2.0 - 1.0)
 
-        # Select based on random value
-        rand_val = random.random()
-        for item, cum_prob in cumulative_probs:
-            if rand_val <= cum_prob:
-                return item
-
-        # Fallback to B1 if something goes wrong
-        return "B1"
-
-    def get_language_level_instructions(self, language_level: str) -> str:
+    @staticmethod
+    def get_language_level_instructions(language_level: str) -> str:
         """
         Get specific instructions for the selected language level
 
@@ -649,21 +716,7 @@ class DynamicResponseManager:
         Returns:
             Instructions for the model to generate a response at the appropriate language level
         """
-        if language_level == "A1":
-            return "Use mostly simple German with basic vocabulary and grammar. Focus on everyday words and simple sentence structures. Use mainly present tense. Keep explanations brief and straightforward. This is like how a beginner would speak German, but still sound natural and human-like. Don't be robotic or overly simplified - real beginners still try to express complex thoughts with simple language."
-        elif language_level == "A2":
-            return "Use simple but slightly more varied German. Include some basic connectors beyond 'und' and 'aber'. Use present tense primarily but occasionally include perfect tense for past events. Express basic opinions and preferences. Use vocabulary related to everyday situations and personal experiences. This is like how someone with elementary German knowledge would speak - simple but starting to become more expressive."
-        elif language_level == "B1":
-            return "Use moderately complex German with a good range of everyday vocabulary. Mix simple and compound sentences naturally. Include some subordinate clauses. Use different tenses as needed. Express opinions and give brief explanations. Use some idiomatic expressions. This is like how an intermediate German speaker would communicate - comfortable with everyday topics but still making occasional mistakes."
-        elif language_level == "B2":
-            return "Use more complex German with a broader vocabulary. Construct varied sentence structures. Express opinions clearly with supporting details. Discuss abstract concepts with some limitations. Use different tenses and moods appropriately. Include idiomatic expressions naturally. This is like how an upper-intermediate German speaker would communicate - generally fluent but still with some limitations in nuance."
-        elif language_level == "C1":
-            return "Use advanced German with rich vocabulary and varied expressions. Construct complex sentences with different subordinate clauses. Express nuanced opinions and develop arguments. Use precise vocabulary for specific contexts. Include cultural references and idiomatic expressions. This is like how an advanced German speaker would communicate - fluent and expressive with occasional minor errors."
-        elif language_level == "C2":
-            return "Use sophisticated German with precise and varied vocabulary. Construct complex and elegant sentences. Express subtle nuances and develop detailed arguments. Use specialized terminology when appropriate. Include cultural references, wordplay, and idiomatic expressions naturally. This is like how a near-native German speaker would communicate - highly fluent and nuanced with rare errors."
-        else:
-            # Fallback to B1 if something goes wrong
-            return "Use moderately complex German with a good range of everyday vocabulary. Mix simple and compound sentences naturally. Include some subordinate clauses. Use different tenses as needed. Express opinions and give brief explanations. Use some idiomatic expressions. This is like how an intermediate German speaker would communicate - comfortable with everyday topics but still making occasional mistakes."
+        return _LEVEL_INSTRUCTIONS[language_level if language_level in _VALID_LEVELS else "B1"]
 
     def format_response_length_for_prompt(self, message_content: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -676,16 +729,18 @@ class DynamicResponseManager:
         Returns:
             Formatted response length instructions for the prompt
         """
-        # Her zaman dinamik mesaj uzunluğu etkin olsun
-        response_type = self.get_response_type(message_content, context)
-        instructions = self.get_response_length_instructions(response_type)
+        # Whitespace-only content carries no signal - skip the classifier
+        if not message_content or not message_content.strip():
+            return self._default_length_prompt_empty
 
-        return f"""
-        UZUN VE İNSAN GİBİ YANIT UZUNLUĞU TALİMATI:
-        {instructions}
+        cached = self._cached_prompt("length", message_content, context)
+        if cached is not None:
+            return cached
 
-        ÇOK ÖNEMLİ: Mesaj uzunluğunu tamamen doğal ve insan gibi belirle. Detaylı ve kapsamlı yanıtlar ver. Gerçek bir insan gibi, konuyu derinlemesine açıkla. Normal bir sohbette konuşan biri gibi davran, doğal ve akıcı bir dil kullan. Konuyu tam olarak anlatmak için yeterli uzunlukta cevaplar ver. Örnekler ve açıklamalar ekle. Birden fazla paragraf kullanmaktan çekinme. Konuyu farklı açılardan ele al. Detaylı ve bilgilendirici ol. Kısa ve yetersiz yanıtlardan kaçın. En az 5-7 cümle kullan. Akıcı ve bağlantılı paragraflar oluştur.
-        """
+        # Her zaman dinamik mesaj uzunluğu etkin olsun
+        response_type = self.get_response_type(message_content, context)
+        prompt = self._length_prompts.get(response_type, self._default_length_prompt)
+        return self._store_prompt("length", message_content, context, prompt)
 
     def format_language_level_for_prompt(self, message_content: str, context: Optional[Dict[str, Any]] = None) -> str:
         """
@@ -698,30 +753,32 @@ class DynamicResponseManager:
         Returns:
             Formatted language level instructions for the prompt
         """
-        # Get dynamic language level based on context and content
-        language_level = self.get_language_level(message_content, context)
-        instructions = self.get_language_level_instructions(language_level)
+        # Whitespace-only content carries no signal - skip the classifier
+        if not message_content or not message_content.strip():
+            return self._default_level_prompt_empty
 
-        return f"""
-        NATURAL HUMAN-LIKE GERMAN LANGUAGE INSTRUCTION:
-        {instructions}
+        cached = self._cached_prompt("level", message_content, context)
+        if cached is not None:
+            return cached
 
-        EXTREMELY IMPORTANT: Speak German in a completely natural, human-like way. Your language level should be dynamic and unpredictable like a real human's.
+        # Get dynamic language level based on context and content; the level
+        # is always one of the pre-rendered keys, so index the fused prompt
+        # dict directly without materializing the bare instruction string
+        prompt = self._level_prompts[self.get_language_level(message_content, context)]
+        return self._store_prompt("level", message_content, context, prompt)
 
-        NATURAL LANGUAGE GUIDELINES:
-        - Speak exactly like a real human would in casual conversation
-        - Let your language complexity vary naturally within a conversation
-        - Sometimes use simple language, sometimes more complex depending on the context
-        - Don't follow rigid rules about what words or grammar to use
-        - Occasionally make small grammar mistakes like real humans do
-        - Use natural sentence structures that vary in complexity
-        - Mix short and longer sentences like humans naturally do
-        - Sometimes use slang or colloquial expressions when appropriate
-        - Adjust your language complexity based on the topic and context
-        - Be unpredictable in your language patterns
+_CACHE_SENTINEL_CONTEXT = (None, None, None)
+
+
+@functools.lru_cache(maxsize=1)
+def get_dynamic_response_manager() -> DynamicResponseManager:
+    """Return the shared manager instance, constructing it on first use"""
+    return DynamicResponseManager()
 
-        IMPORTANT: Your language should NOT follow a consistent pattern or level. It should vary naturally like a real human's speech, with the general complexity level suggested above as just a starting point. Be dynamic and unpredictable in your language use.
-        """
 
-# Create a singleton instance
-dynamic_response_manager = DynamicResponseManager()
+def __getattr__(name: str) -> Any:
+    # Keep `from dynamic_response import dynamic_response_manager` working
+    # without paying construction (and prompt pre-rendering) cost at import
+    if name == "dynamic_response_manager":
+        return get_dynamic_response_manager()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
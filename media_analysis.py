@@ -34,12 +34,7 @@ async def analyze_image(image_path: str) -> Dict[str, Any]:
         # Configure Gemini model for image analysis
         model = genai.GenerativeModel(
             model_name=config.GEMINI_IMAGE_MODEL,
-            generation_config={
-                "temperature": config.GEMINI_IMAGE_TEMPERATURE,
-                "top_p": config.GEMINI_IMAGE_TOP_P,
-                "top_k": config.GEMINI_IMAGE_TOP_K,
-                "max_output_tokens": config.GEMINI_IMAGE_MAX_OUTPUT_TOKENS,
-            },
+            generation_config=config.GEMINI_IMAGE_GEN_CONFIG,
             safety_settings=config.SAFETY_SETTINGS
         )
 
@@ -90,12 +85,7 @@ async def analyze_video(video_path: str) -> Dict[str, Any]:
         # Configure Gemini model for video analysis
         model = genai.GenerativeModel(
             model_name=config.GEMINI_IMAGE_MODEL,
-            generation_config={
-                "temperature": config.GEMINI_IMAGE_TEMPERATURE,
-                "top_p": config.GEMINI_IMAGE_TOP_P,
-                "top_k": config.GEMINI_IMAGE_TOP_K,
-                "max_output_tokens": config.GEMINI_IMAGE_MAX_OUTPUT_TOKENS,
-            },
+            generation_config=config.GEMINI_IMAGE_GEN_CONFIG,
             safety_settings=config.SAFETY_SETTINGS
         )
 
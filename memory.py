@@ -1,7 +1,9 @@
 import os
 import json
 import logging
-from typing import Dict, List
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, List
 import config
 
 # Configure logging
@@ -9,8 +11,17 @@ logger = logging.getLogger(__name__)
 
 class Memory:
     def __init__(self):
-        # Dictionary to store conversations by chat_id
-        self.conversations: Dict[int, List[Dict[str, str]]] = {}
+        # Conversations by chat_id; the deque maxlen enforces the long
+        # memory bound without re-slicing the list on every message
+        self.conversations: Dict[int, Deque[Dict[str, str]]] = {}
+
+        # Cached "User:/Puro:" rendering of the last five messages per chat,
+        # rebuilt lazily after each add_message
+        self._last5_fmt: Dict[int, str] = {}
+
+        # Per-chat "user:/model:" turn strings for prompt assembly, formatted
+        # once when each message arrives instead of on every request
+        self._turns_fmt: Dict[int, Deque[str]] = {}
 
         # Create memory directory if it doesn't exist
         os.makedirs(config.MEMORY_DIR, exist_ok=True)
@@ -28,16 +39,17 @@ class Memory:
             content: The message content
         """
         if chat_id not in self.conversations:
-            self.conversations[chat_id] = []
+            self.conversations[chat_id] = deque(maxlen=config.LONG_MEMORY_SIZE)
+            self._turns_fmt[chat_id] = deque(maxlen=config.LONG_MEMORY_SIZE)
 
+        # The deque maxlen drops the oldest message automatically once the
+        # long memory size is reached
         self.conversations[chat_id].append({
             "role": role,
             "content": content
         })
-
-        # Trim the conversation if it exceeds the long memory size
-        if len(self.conversations[chat_id]) > config.LONG_MEMORY_SIZE:
-            self.conversations[chat_id] = self.conversations[chat_id][-config.LONG_MEMORY_SIZE:]
+        self._turns_fmt[chat_id].append(self._format_turn(role, content))
+        self._last5_fmt.pop(chat_id, None)
 
         # Save the updated memory to disk
         self._save_memory(chat_id)
@@ -52,12 +64,14 @@ class Memory:
         Returns:
             List of message dictionaries with 'role' and 'content' keys
         """
-        if chat_id not in self.conversations:
+        conversation = self.conversations.get(chat_id)
+        if not conversation:
             return []
 
-        return self.conversations[chat_id][-config.SHORT_MEMORY_SIZE:]
+        start = max(0, len(conversation) - config.SHORT_MEMORY_SIZE)
+        return list(islice(conversation, start, len(conversation)))
 
-    def get_long_memory(self, chat_id: int) -> List[Dict[str, str]]:
+    def get_long_memory(self, chat_id: int) -> Deque[Dict[str, str]]:
         """
         Get the long-term memory (all stored messages) for a specific chat
 
@@ -65,13 +79,63 @@ class Memory:
             chat_id: The Telegram chat ID
 
         Returns:
-            List of message dictionaries with 'role' and 'content' keys
+            Deque of message dictionaries with 'role' and 'content' keys
         """
         if chat_id not in self.conversations:
-            return []
+            return deque()
 
         return self.conversations[chat_id]
 
+    @staticmethod
+    def _format_turn(role: str, content: str) -> str:
+        """Render one message as a "user:/model:" prompt line"""
+        return f"{'user' if role == 'user' else 'model'}: {content}"
+
+    def short_fmt(self, chat_id: int) -> str:
+        """
+        Get the short-term memory rendered as "user:/model:" prompt lines;
+        each turn is formatted once on arrival, so this is just a join
+
+        Args:
+            chat_id: The Telegram chat ID
+
+        Returns:
+            Formatted short memory ready for prompt assembly
+        """
+        turns = self._turns_fmt.get(chat_id)
+        if not turns:
+            return ""
+
+        start = max(0, len(turns) - config.SHORT_MEMORY_SIZE)
+        return "\n".join(islice(turns, start, len(turns)))
+
+    def last5_fmt(self, chat_id: int) -> str:
+        """
+        Get the last five messages rendered for prompt inclusion, cached
+        until the next add_message for the chat
+
+        Args:
+            chat_id: The Telegram chat ID
+
+        Returns:
+            "User:/Puro:" formatted string of the most recent five messages
+        """
+        cached = self._last5_fmt.get(chat_id)
+        if cached is not None:
+            return cached
+
+        conversation = self.conversations.get(chat_id)
+        if not conversation:
+            return ""
+
+        start = max(0, len(conversation) - 5)
+        formatted = "\n".join(
+            f"{'User' if message['role'] == 'user' else 'Puro'}: {message['content']}"
+            for message in islice(conversation, start, len(conversation))
+        )
+        self._last5_fmt[chat_id] = formatted
+        return formatted
+
     def _get_memory_file_path(self, chat_id: int) -> str:
         """
         Get the file path for a specific chat's memory file
@@ -94,7 +158,7 @@ class Memory:
         try:
             memory_file = self._get_memory_file_path(chat_id)
             with open(memory_file, 'w', encoding='utf-8') as f:
-                json.dump(self.conversations[chat_id], f, ensure_ascii=False, indent=2)
+                json.dump(list(self.conversations[chat_id]), f, ensure_ascii=False, indent=2)
             logger.debug(f"Saved memory for chat {chat_id} to {memory_file}")
         except Exception as e:
             logger.error(f"Error saving memory for chat {chat_id}: {e}")
@@ -110,12 +174,17 @@ class Memory:
         if os.path.exists(memory_file):
             try:
                 with open(memory_file, 'r', encoding='utf-8') as f:
-                    self.conversations[chat_id] = json.load(f)
+                    self.conversations[chat_id] = deque(json.load(f), maxlen=config.LONG_MEMORY_SIZE)
+                self._turns_fmt[chat_id] = deque(
+                    (self._format_turn(m["role"], m["content"]) for m in self.conversations[chat_id]),
+                    maxlen=config.LONG_MEMORY_SIZE
+                )
                 logger.info(f"Loaded memory for chat {chat_id} with {len(self.conversations[chat_id])} messages")
             except Exception as e:
                 logger.error(f"Error loading memory for chat {chat_id}: {e}")
                 # Initialize empty conversation if loading fails
-                self.conversations[chat_id] = []
+                self.conversations[chat_id] = deque(maxlen=config.LONG_MEMORY_SIZE)
+                self._turns_fmt[chat_id] = deque(maxlen=config.LONG_MEMORY_SIZE)
 
     def _load_all_memories(self) -> None:
         """
@@ -0,0 +1,79 @@
+import logging
+from collections import deque
+from typing import Deque, Dict, Optional, Tuple
+
+# Configure logging
+logger = logging.getLogger(__name__)
+
+class SemanticCache:
+    """
+    Two-tier in-process cache for generated responses keyed on the user's
+    message: an exact lookup on the normalized text first, then a token-set
+    similarity match over recent entries. Near-duplicate small talk
+    ("hi", "Hi!", "hi there") can then reuse a response without a Gemini
+    call. Similarity uses Jaccard overlap of lowercased word sets — cheap,
+    dependency-free, and good enough for the short messages this targets.
+    """
+
+    def __init__(self, maxsize: int = 512, threshold: float = 0.9):
+        self._exact: Dict[Tuple[str, str], str] = {}
+        # Recent (token set, language, response) entries, oldest first
+        self._entries: Deque[Tuple[frozenset, str, str]] = deque(maxlen=maxsize)
+        self._maxsize = maxsize
+        self._threshold = threshold
+
+    @staticmethod
+    def _normalize(message: str) -> str:
+        """Normalize a message for exact matching"""
+        return " ".join(message.lower().split())
+
+    @staticmethod
+    def _tokens(message: str) -> frozenset:
+        """Token set used for the similarity tier"""
+        return frozenset(message.lower().split())
+
+    def lookup(self, message: str, language: str) -> Optional[str]:
+        """
+        Look up a cached response for a message
+
+        Args:
+            message: The user's message
+            language: Detected language of the conversation
+
+        Returns:
+            A cached response, or None on miss
+        """
+        normalized = self._normalize(message)
+        exact_hit = self._exact.get((normalized, language))
+        if exact_hit is not None:
+            logger.debug("Semantic cache exact hit for message: '%s'", normalized[:50])
+            return exact_hit
+
+        tokens = self._tokens(message)
+        if not tokens:
+            return None
+
+        for cached_tokens, cached_language, cached_response in self._entries:
+            if cached_language != language or not cached_tokens:
+                continue
+            overlap = len(tokens & cached_tokens) / len(tokens | cached_tokens)
+            if overlap >= self._threshold:
+                logger.debug("Semantic cache similarity hit (%.2f) for message: '%s'", overlap, normalized[:50])
+                return cached_response
+
+        return None
+
+    def insert(self, message: str, language: str, response: str) -> None:
+        """
+        Store a generated response for later reuse
+
+        Args:
+            message: The user's message
+            language: Detected language of the conversation
+            response: The generated response to cache
+        """
+        if len(self._exact) >= self._maxsize:
+            # Same clear-on-full policy as the other in-process caches
+            self._exact.clear()
+        self._exact[(self._normalize(message), language)] = response
+        self._entries.append((self._tokens(message), language, response))
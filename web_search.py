@@ -47,7 +47,7 @@ def generate_search_queries(user_query: str, chat_history: List[Dict[str, str]])
         Make the queries specific, focused, and likely to return relevant information.
 
         Recent conversation:
-        {format_chat_history(chat_history[-5:] if len(chat_history) > 5 else chat_history)}
+        {format_chat_history(chat_history[-5:])}
 
         User's latest query: {user_query}
 
@@ -274,12 +274,7 @@ def search_with_gemini(query: str) -> Dict[str, Any]:
         # Use Gemini to generate a response that simulates web search results
         model = genai.GenerativeModel(
             model_name=config.GEMINI_FLASH_LITE_MODEL,
-            generation_config={
-                "temperature": config.GEMINI_FLASH_LITE_TEMPERATURE,
-                "top_p": config.GEMINI_FLASH_LITE_TOP_P,
-                "top_k": config.GEMINI_FLASH_LITE_TOP_K,
-                "max_output_tokens": config.GEMINI_FLASH_LITE_MAX_OUTPUT_TOKENS,
-            },
+            generation_config=config.GEMINI_FLASH_LITE_GEN_CONFIG,
             safety_settings=config.SAFETY_SETTINGS
         )
 